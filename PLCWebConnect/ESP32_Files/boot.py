@@ -7,7 +7,7 @@ import gc
 import network
 import time
 import sys
-from machine import Pin
+from machine import Pin, Timer
 
 def boot_delay_with_interrupt():
     """5-second boot delay allowing file upload interruption"""
@@ -20,15 +20,24 @@ def boot_delay_with_interrupt():
         print("and upload new files...")
         print()
         
+        # Blink LED from a hardware timer so the countdown just sleeps
+        timer = Timer(0)
+        state = [False]
+        
+        def _tick(_):
+            state[0] = not state[0]
+            led.value(state[0])
+        
+        timer.init(period=500, mode=Timer.PERIODIC, callback=_tick)
+        
         # 5-second countdown with LED indicator
-        for countdown in range(5, 0, -1):
-            print(f"Starting in {countdown} seconds... (Ctrl+C to interrupt)")
-            
-            # Blink LED during countdown
-            led.on()
-            time.sleep(0.5)
+        try:
+            for countdown in range(5, 0, -1):
+                print(f"Starting in {countdown} seconds... (Ctrl+C to interrupt)")
+                time.sleep(1)  # KeyboardInterrupt still breaks this
+        finally:
+            timer.deinit()
             led.off()
-            time.sleep(0.5)
             
         print()
         print("Boot delay complete - starting main application")
@@ -1,8 +1,11 @@
 """
 ESP-32 Configuration file
 Edit these settings for your specific setup before uploading
+Integer settings are wrapped in const() - keep the wrapper when editing
 """
 
+from micropython import const
+
 # WiFi Settings - EDIT THESE VALUES
 WIFI_SSID = "YOUR_WIFI_SSID"
 WIFI_PASSWORD = "YOUR_WIFI_PASSWORD"
@@ -10,28 +13,34 @@ WIFI_PASSWORD = "YOUR_WIFI_PASSWORD"
 # Access Point Settings (fallback when WiFi fails)
 AP_SSID = "ESP32-PLC-Setup"
 AP_PASSWORD = "plcsetup123"  # At least 8 characters
-AP_CHANNEL = 1
-AP_MAX_CLIENTS = 4
+AP_CHANNEL = const(1)
+AP_MAX_CLIENTS = const(4)
 
 # Hardware Pin Configuration
-UART_TX_PIN = 17  # GPIO17 - Connect to PLC RX
-UART_RX_PIN = 16  # GPIO16 - Connect to PLC TX
-STATUS_LED_PIN = 2  # Built-in LED
-UART_PORT = 2  # Use UART2
+UART_TX_PIN = const(17)  # GPIO17 - Connect to PLC RX
+UART_RX_PIN = const(16)  # GPIO16 - Connect to PLC TX
+STATUS_LED_PIN = const(2)  # Built-in LED
+UART_PORT = const(2)  # Use UART2
 
 # PLC Communication Settings
-BAUD_RATE = 9600  # Match your PLC settings
-DEVICE_ADDRESS = 1  # Modbus slave address of PLC
-UART_TIMEOUT = 1000  # milliseconds
+BAUD_RATE = const(9600)  # Match your PLC settings
+DEVICE_ADDRESS = const(1)  # Modbus slave address of PLC
+UART_CHAR_TIMEOUT = const(4)  # milliseconds of silence ending a reply (3.5 chars at 9600)
+
+# PLC Poll Blocks - each is read with one Modbus request per poll
+POLL_INPUT_COUNT = const(16)  # X000 onward (discrete inputs)
+POLL_COIL_COUNT = const(16)  # Y000 onward (coils)
+POLL_REGISTER_COUNT = const(10)  # DS001 onward (holding registers)
 
 # Web Server Settings
-WEB_PORT = 80
+WEB_PORT = const(80)
 POLL_INTERVAL = 2.0  # seconds between PLC polls
 
 # System Settings
-MAX_RETRIES = 3
-WIFI_TIMEOUT = 15  # seconds to try connecting to WiFi
-RESPONSE_TIMEOUT = 100  # milliseconds for Modbus responses
+MAX_RETRIES = const(3)
+WIFI_TIMEOUT = const(15)  # seconds to try connecting to WiFi
+RESPONSE_TIMEOUT = const(100)  # milliseconds for Modbus responses
+LOG_LEVEL = "INFO"  # DEBUG, INFO, WARN or ERROR - lower-level messages are not printed
 
 # Access Point Network Configuration
 AP_IP = "192.168.4.1"
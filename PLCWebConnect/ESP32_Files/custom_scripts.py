@@ -6,21 +6,38 @@ Lightweight automation scripts for GPIO control and Modbus operations
 import gc
 import time
 from machine import Pin
+from plc_scripts import status_led, emergency_stop, temp_alarm
+
+# ESP32 GPIO numbers run 0-39
+_NUM_PINS = 40
+_MODE_NONE = 0
+_MODE_OUTPUT = 1
+_MODE_INPUT = 2
 
 class ESP32GPIOController:
     """Lightweight GPIO controller for ESP-32"""
     
     def __init__(self):
-        self.pins = {}
+        # Fixed-size tables indexed by GPIO number
+        self.pins = [None] * _NUM_PINS
+        self.pin_modes = bytearray(_NUM_PINS)
+        self.pin_values = bytearray(_NUM_PINS)
+        # Report view for configured pins, refreshed by get_pin_states
         self.pin_states = {}
         
     def setup_pin(self, pin_num, mode="output"):
         """Setup a GPIO pin"""
+        if not 0 <= pin_num < _NUM_PINS:
+            print(f"GPIO setup error pin {pin_num}: invalid pin number")
+            return False
         try:
             if mode == "output":
                 self.pins[pin_num] = Pin(pin_num, Pin.OUT)
+                self.pin_modes[pin_num] = _MODE_OUTPUT
             else:
                 self.pins[pin_num] = Pin(pin_num, Pin.IN)
+                self.pin_modes[pin_num] = _MODE_INPUT
+            self.pin_values[pin_num] = 0
             self.pin_states[pin_num] = {"mode": mode, "value": False}
             return True
         except Exception as e:
@@ -28,44 +45,65 @@ class ESP32GPIOController:
             return False
     
     def set_pin(self, pin_num, value):
-        """Set GPIO pin state"""
-        try:
-            if pin_num in self.pins:
-                if value:
-                    self.pins[pin_num].on()
-                else:
-                    self.pins[pin_num].off()
-                self.pin_states[pin_num]["value"] = value
-                return True
-            return False
-        except Exception as e:
-            print(f"GPIO set error pin {pin_num}: {e}")
+        """Set GPIO pin state (pin must have been set up)"""
+        p = self.pins[pin_num] if 0 <= pin_num < _NUM_PINS else None
+        if p is None:
             return False
+        v = 1 if value else 0
+        p.value(v)
+        self.pin_values[pin_num] = v
+        return True
     
     def get_pin(self, pin_num):
-        """Get GPIO pin state"""
-        try:
-            if pin_num in self.pins:
-                value = self.pins[pin_num].value()
-                self.pin_states[pin_num]["value"] = bool(value)
-                return bool(value)
-            return False
-        except Exception as e:
-            print(f"GPIO read error pin {pin_num}: {e}")
+        """Get GPIO pin state (pin must have been set up)"""
+        p = self.pins[pin_num] if 0 <= pin_num < _NUM_PINS else None
+        if p is None:
             return False
+        value = p.value()
+        self.pin_values[pin_num] = value
+        return bool(value)
     
     def get_pin_states(self):
-        """Get all pin states"""
-        return self.pin_states.copy()
+        """Get all pin states (shared dict, treat as read-only)"""
+        pin_values = self.pin_values
+        for pin_num, state in self.pin_states.items():
+            state["value"] = bool(pin_values[pin_num])
+        return self.pin_states
 
 class ESP32ScriptEngine:
     """Lightweight script engine for ESP-32"""
     
-    def __init__(self, modbus_client=None):
+    def __init__(self, modbus_client=None, device_address=1):
         self.gpio = ESP32GPIOController()
         self.modbus = modbus_client
-        self.scripts = {}
-        self.enabled_scripts = set()
+        self.device_address = device_address
+        self.scripts_list = []  # indexed by integer script id
+        self._id_by_name = {}  # public string id -> integer id
+        self.enabled_mask = 0  # bit N set when script N is enabled
+        self._result_pool = []  # one reusable result dict per script
+        self._all_results = {}  # pooled results of enabled scripts by id
+        self._result_dict = {"results": self._all_results}
+        self._empty_result = {
+            "results": {},
+            "gpio_states": self.gpio.pin_states,
+            "memory_free": 0,
+            "timestamp": 0
+        }
+        
+        # Shared execution environment, plc_data is swapped in per call
+        self._base_globals = {
+            "plc_data": None,
+            "gpio": self.gpio,
+            "time": time,
+            "ticks_ms": time.ticks_ms,
+            "set_pin": self.gpio.set_pin,
+            "get_pin": self.gpio.get_pin,
+            "print": print,
+            "write_coil": self._write_coil_wrapper,
+            "write_multiple_coils": self._write_multiple_coils_wrapper,
+            "write_register": self._write_register_wrapper
+        }
+        
         self.load_default_scripts()
         
         # Setup common GPIO pins
@@ -77,122 +115,112 @@ class ESP32ScriptEngine:
         """Load essential scripts for ESP-32"""
         
         # Status LED blinker
-        self.scripts["status_led"] = {
+        self._add_script("status_led", {
             "name": "Status LED Blinker",
             "description": "Blinks built-in LED based on PLC connection",
             "enabled": True,
-            "code": """
-# Status LED control
-if plc_data.get('connected', False):
-    # Slow blink when connected
-    if time.ticks_ms() % 2000 < 1000:
-        gpio.set_pin(2, True)
-    else:
-        gpio.set_pin(2, False)
-else:
-    # Fast blink when disconnected
-    if time.ticks_ms() % 500 < 250:
-        gpio.set_pin(2, True)
-    else:
-        gpio.set_pin(2, False)
-"""
-        }
+            "fn": status_led
+        })
         
         # Emergency stop monitor
-        self.scripts["emergency_stop"] = {
+        self._add_script("emergency_stop", {
             "name": "Emergency Stop Monitor",
             "description": "Monitors emergency stop button and activates safety outputs",
             "enabled": False,
-            "code": """
-# Emergency stop logic
-emergency_input = plc_data.get('digital_inputs', {}).get(1, False)
-if not emergency_input:  # Emergency stop pressed (normally closed)
-    # Turn off all outputs
-    for addr in range(1, 9):
-        if write_coil:
-            write_coil(addr, False)
-    # Activate alarm output
-    gpio.set_pin(4, True)
-else:
-    gpio.set_pin(4, False)
-"""
-        }
+            "fn": emergency_stop
+        })
         
         # Temperature alarm
-        self.scripts["temp_alarm"] = {
+        self._add_script("temp_alarm", {
             "name": "Temperature Alarm",
             "description": "Temperature monitoring with GPIO alarm output",
             "enabled": False,
-            "code": """
-# Temperature alarm (assuming register 1 is temperature)
-temp_value = plc_data.get('data_registers', {}).get(1, 0)
-if temp_value > 750:  # 75.0 degrees (assuming 0.1 degree resolution)
-    gpio.set_pin(5, True)  # Activate alarm
-    print(f"Temperature alarm: {temp_value/10}°C")
-elif temp_value < 700:  # Hysteresis
-    gpio.set_pin(5, False)
-"""
-        }
-        
-        # Add enabled scripts to the set
-        for script_id, script in self.scripts.items():
-            if script.get("enabled", False):
-                self.enabled_scripts.add(script_id)
+            "fn": temp_alarm
+        })
     
-    def execute_script(self, script_id, plc_data):
-        """Execute a single script safely"""
-        if script_id not in self.scripts or script_id not in self.enabled_scripts:
-            return {"success": False, "error": "Script not found or disabled"}
-        
-        script = self.scripts[script_id]
-        result = {
+    def _add_script(self, script_id, script):
+        """Register a script under the next integer id"""
+        sid = len(self.scripts_list)
+        script["id"] = script_id
+        # Compile source scripts once so polls only run bytecode
+        if "code" in script:
+            script["compiled"] = compile(script["code"], script_id, "exec")
+        self.scripts_list.append(script)
+        self._result_pool.append({
             "script_id": script_id,
             "success": False,
             "error": None,
             "execution_time": 0
-        }
+        })
+        self._id_by_name[script_id] = sid
+        if script.get("enabled", False):
+            self.enabled_mask |= (1 << sid)
+            self._all_results[script_id] = self._result_pool[sid]
+        return sid
+    
+    def execute_script(self, script_id, plc_data):
+        """Execute a single script safely
+        
+        The returned dict is reused on the next run of the same script,
+        copy it if it must be kept.
+        """
+        sid = self._id_by_name.get(script_id)
+        if sid is None or not self.enabled_mask & (1 << sid):
+            return {"success": False, "error": "Script not found or disabled"}
+        return self._run_script(sid, plc_data)
+    
+    def _run_script(self, sid, plc_data):
+        """Execute a script by integer id into its pooled result dict"""
+        script = self.scripts_list[sid]
+        result = self._result_pool[sid]
+        result["success"] = False
+        result["error"] = None
         
         start_time = time.ticks_ms()
         
         try:
-            # Create safe execution environment
-            script_globals = {
-                "plc_data": plc_data,
-                "gpio": self.gpio,
-                "time": time,
-                "print": print,
-                "write_coil": self._write_coil_wrapper,
-                "write_register": self._write_register_wrapper
-            }
-            
-            # Execute script code
-            exec(script["code"], script_globals)
+            fn = script.get("fn")
+            if fn:
+                # Built-in scripts are plain functions
+                fn(plc_data, self.gpio, self._write_multiple_coils_wrapper)
+            else:
+                # Reuse shared execution environment
+                script_globals = self._base_globals
+                script_globals["plc_data"] = plc_data
+                
+                # Execute precompiled script code
+                exec(script["compiled"], script_globals)
             result["success"] = True
             
         except Exception as e:
             result["error"] = str(e)
-            print(f"Script {script_id} error: {e}")
+            print(f"Script {script['id']} error: {e}")
         
         result["execution_time"] = time.ticks_diff(time.ticks_ms(), start_time)
         return result
     
     def execute_enabled_scripts(self, plc_data):
         """Execute all enabled scripts"""
-        results = {}
+        if not self.enabled_mask:
+            # Nothing to run, refresh the prebuilt report in place
+            empty = self._empty_result
+            self.gpio.get_pin_states()
+            empty["memory_free"] = gc.mem_free()
+            empty["timestamp"] = time.ticks_ms()
+            return empty
         
-        for script_id in list(self.enabled_scripts):  # Create copy to avoid modification during iteration
-            if script_id in self.scripts:
-                results[script_id] = self.execute_script(script_id, plc_data)
+        # Each run updates its pooled entry in _all_results in place
+        mask = self.enabled_mask
+        for sid in range(len(self.scripts_list)):
+            if mask & (1 << sid):
+                self._run_script(sid, plc_data)
         
-        # Memory cleanup
-        gc.collect()
-        
-        return {
-            "results": results,
-            "gpio_states": self.gpio.get_pin_states(),
-            "memory_free": gc.mem_free(),
-            "timestamp": time.ticks_ms()
-        }
+        # Repopulate the shared result dict in place
+        result_dict = self._result_dict
+        result_dict["gpio_states"] = self.gpio.get_pin_states()
+        result_dict["memory_free"] = gc.mem_free()
+        result_dict["timestamp"] = time.ticks_ms()
+        return result_dict
     
     def _write_coil_wrapper(self, address, value):
         """Safe wrapper for PLC coil writing"""
@@ -204,6 +232,16 @@ elif temp_value < 700:  # Hysteresis
                 return False
         return False
     
+    def _write_multiple_coils_wrapper(self, start_addr, values):
+        """Safe wrapper for PLC multiple coil writing"""
+        if self.modbus:
+            try:
+                return self.modbus.write_multiple_coils(self.device_address, start_addr, values)
+            except Exception as e:
+                print(f"Modbus write coils error: {e}")
+                return False
+        return False
+    
     def _write_register_wrapper(self, address, value):
         """Safe wrapper for PLC register writing"""
         if self.modbus:
@@ -216,44 +254,56 @@ elif temp_value < 700:  # Hysteresis
     
     def enable_script(self, script_id):
         """Enable a script"""
-        if script_id in self.scripts:
-            self.scripts[script_id]["enabled"] = True
-            self.enabled_scripts.add(script_id)
+        sid = self._id_by_name.get(script_id)
+        if sid is not None:
+            self.scripts_list[sid]["enabled"] = True
+            self.enabled_mask |= (1 << sid)
+            self._all_results[script_id] = self._result_pool[sid]
             return True
         return False
     
     def disable_script(self, script_id):
         """Disable a script"""
-        if script_id in self.scripts:
-            self.scripts[script_id]["enabled"] = False
-            self.enabled_scripts.discard(script_id)
+        sid = self._id_by_name.get(script_id)
+        if sid is not None:
+            self.scripts_list[sid]["enabled"] = False
+            self.enabled_mask &= ~(1 << sid)
+            self._all_results.pop(script_id, None)
             return True
         return False
     
     def get_script_info(self, script_id):
         """Get script information"""
-        if script_id in self.scripts:
-            script = self.scripts[script_id].copy()
-            script["enabled"] = script_id in self.enabled_scripts
-            return script
+        sid = self._id_by_name.get(script_id)
+        if sid is not None:
+            script = self.scripts_list[sid]
+            return {
+                "name": script["name"],
+                "description": script["description"],
+                "enabled": bool(self.enabled_mask & (1 << sid)),
+                "code": script.get("code")
+            }
         return None
     
     def get_all_scripts(self):
         """Get all script information"""
         result = {}
-        for script_id, script in self.scripts.items():
-            script_info = script.copy()
-            script_info["enabled"] = script_id in self.enabled_scripts
-            result[script_id] = script_info
+        for sid, script in enumerate(self.scripts_list):
+            result[script["id"]] = {
+                "name": script["name"],
+                "description": script["description"],
+                "enabled": bool(self.enabled_mask & (1 << sid))
+            }
         return result
 
-def create_script_engine(modbus_client=None):
+def create_script_engine(modbus_client=None, device_address=1):
     """Factory function to create script engine"""
-    return ESP32ScriptEngine(modbus_client)
+    return ESP32ScriptEngine(modbus_client, device_address)
 
 # Usage example:
 """
 # In your main ESP-32 application:
+import array
 from custom_scripts import create_script_engine
 
 # Create script engine
@@ -262,8 +312,9 @@ script_engine = create_script_engine(modbus_client)
 # In your main loop:
 plc_data = {
     'connected': True,
-    'digital_inputs': {1: True, 2: False},
-    'data_registers': {1: 720}  # Temperature example
+    'inputs': bytearray([1, 0]),
+    'coils': bytearray(2),
+    'registers': array.array('H', [720])  # Temperature example
 }
 
 # Execute scripts
@@ -0,0 +1,241 @@
+"""
+ESP-32 web page scaffolding
+Static HTML/CSS/JS kept as bytes constants so a frozen build serves them
+straight from flash. Non-ASCII icons are written as HTML entities or JS
+escapes because bytes literals are ASCII only.
+"""
+
+# Config portal up to the network list
+PORTAL_HEAD = b'''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>ESP-32 PLC Bridge - WiFi Setup</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background: #f0f0f0; }
+        .container { max-width: 500px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.1); }
+        .header { text-align: center; margin-bottom: 30px; }
+        .header h1 { color: #333; margin-bottom: 10px; }
+        .header p { color: #666; }
+        .section { margin-bottom: 25px; }
+        .section h3 { color: #333; margin-bottom: 15px; }
+        .network-list { max-height: 300px; overflow-y: auto; border: 1px solid #ddd; border-radius: 5px; }
+        .network-item { padding: 15px; border-bottom: 1px solid #eee; cursor: pointer; display: flex; justify-content: space-between; align-items: center; }
+        .network-item:hover { background: #f8f9fa; }
+        .network-item.selected { background: #007bff; color: white; }
+        .network-name { font-weight: bold; }
+        .network-signal { font-size: 12px; color: #666; }
+        .network-item.selected .network-signal { color: #ccc; }
+        .form-group { margin-bottom: 15px; }
+        .form-group label { display: block; margin-bottom: 5px; font-weight: bold; color: #333; }
+        .form-group input { width: 100%; padding: 12px; border: 1px solid #ddd; border-radius: 5px; font-size: 16px; }
+        .btn { background: #007bff; color: white; padding: 12px 30px; border: none; border-radius: 5px; cursor: pointer; font-size: 16px; width: 100%; }
+        .btn:hover { background: #0056b3; }
+        .btn:disabled { background: #ccc; cursor: not-allowed; }
+        .status { padding: 10px; margin: 15px 0; border-radius: 5px; text-align: center; }
+        .status.success { background: #d4edda; color: #155724; border: 1px solid #c3e6cb; }
+        .status.error { background: #f8d7da; color: #721c24; border: 1px solid #f5c6cb; }
+        .hidden { display: none; }
+        .refresh-btn { background: #28a745; margin-bottom: 15px; }
+        .refresh-btn:hover { background: #218838; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>&#x1F527; ESP-32 PLC Bridge</h1>
+            <p>WiFi Configuration Portal</p>
+        </div>
+        
+        <div class="section">
+            <h3>&#x1F4E1; Available Networks</h3>
+            <button class="btn refresh-btn" onclick="refreshNetworks()">&#x1F504; Refresh Networks</button>
+            <div class="network-list" id="networkList">
+                '''
+
+# Network list close through the access point name
+PORTAL_NETWORKS_END = b'''
+            </div>
+        </div>
+        
+        <div class="section">
+            <h3>&#x1F511; WiFi Credentials</h3>
+            <form id="wifiForm" onsubmit="connectWifi(event)">
+                <div class="form-group">
+                    <label for="ssid">Network Name (SSID):</label>
+                    <input type="text" id="ssid" name="ssid" required>
+                </div>
+                <div class="form-group" id="passwordGroup">
+                    <label for="password">Password:</label>
+                    <input type="password" id="password" name="password">
+                </div>
+                <button type="submit" class="btn" id="connectBtn">&#x1F517; Connect to WiFi</button>
+            </form>
+        </div>
+        
+        <div id="status" class="status hidden"></div>
+        
+        <div class="section">
+            <h3>&#x2139;&#xFE0F; Device Information</h3>
+            <p><strong>Device:</strong> ESP-32 PLC Bridge</p>
+            <p><strong>Access Point:</strong> '''
+PORTAL_AP_IP = b'''</p>
+            <p><strong>IP Address:</strong> '''
+PORTAL_FREE_MEMORY = b'''</p>
+            <p><strong>Free Memory:</strong> '''
+
+# Free memory units, portal script and page close
+PORTAL_TAIL = b''' bytes</p>
+        </div>
+    </div>
+    
+    <script>
+        let selectedNetwork = null;
+        
+        function selectNetwork(ssid, secure) {
+            // Remove previous selection
+            document.querySelectorAll('.network-item').forEach(item => {
+                item.classList.remove('selected');
+            });
+            
+            // Select clicked network
+            event.currentTarget.classList.add('selected');
+            selectedNetwork = {ssid: ssid, secure: secure};
+            
+            // Fill form
+            document.getElementById('ssid').value = ssid;
+            
+            // Show/hide password field
+            const passwordGroup = document.getElementById('passwordGroup');
+            if (secure) {
+                passwordGroup.style.display = 'block';
+                document.getElementById('password').required = true;
+            } else {
+                passwordGroup.style.display = 'none';
+                document.getElementById('password').required = false;
+                document.getElementById('password').value = '';
+            }
+        }
+        
+        function refreshNetworks() {
+            fetch('/api/networks?force=1').finally(() => window.location.reload());
+        }
+        
+        function showStatus(message, type) {
+            const status = document.getElementById('status');
+            status.textContent = message;
+            status.className = 'status ' + type;
+            status.classList.remove('hidden');
+        }
+        
+        function connectWifi(event) {
+            event.preventDefault();
+            
+            const ssid = document.getElementById('ssid').value;
+            const password = document.getElementById('password').value;
+            const connectBtn = document.getElementById('connectBtn');
+            
+            if (!ssid) {
+                showStatus('Please select or enter a network name', 'error');
+                return;
+            }
+            
+            connectBtn.disabled = true;
+            connectBtn.textContent = '\\u{1F504} Connecting...';
+            showStatus('Attempting to connect to ' + ssid + '...', 'info');
+            
+            fetch('/connect', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({ssid: ssid, password: password})
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showStatus('Connected successfully! Switching to station mode...', 'success');
+                    setTimeout(() => {
+                        window.location.href = 'http://' + data.ip;
+                    }, 3000);
+                } else {
+                    showStatus('Connection failed: ' + data.error, 'error');
+                    connectBtn.disabled = false;
+                    connectBtn.textContent = '\\u{1F517} Connect to WiFi';
+                }
+            })
+            .catch(error => {
+                showStatus('Connection error: ' + error, 'error');
+                connectBtn.disabled = false;
+                connectBtn.textContent = '\\u{1F517} Connect to WiFi';
+            });
+        }
+    </script>
+</body>
+</html>'''
+
+# PLC monitor up to the mode badge
+MONITOR_HEAD = b'''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>ESP-32 PLC Monitor</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background: #f0f0f0; }
+        .container { max-width: 1000px; margin: 0 auto; }
+        .header { background: #007bff; color: white; padding: 20px; border-radius: 5px; margin-bottom: 20px; text-align: center; }
+        .mode-badge { background: rgba(255,255,255,0.2); padding: 5px 10px; border-radius: 15px; font-size: 12px; }
+        .status { display: flex; gap: 15px; margin-bottom: 20px; flex-wrap: wrap; }
+        .status-card { background: white; padding: 20px; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); flex: 1; min-width: 200px; text-align: center; }
+        .connected { color: #28a745; }
+        .disconnected { color: #dc3545; }
+        .data-section { background: white; padding: 20px; border-radius: 5px; margin-bottom: 15px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .io-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(80px, 1fr)); gap: 10px; margin-top: 15px; }
+        .io-item { padding: 12px; border: 2px solid #ddd; border-radius: 5px; text-align: center; font-size: 12px; font-weight: bold; }
+        .io-on { background: #d4edda; border-color: #28a745; color: #155724; }
+        .io-off { background: #f8d7da; border-color: #dc3545; color: #721c24; }
+        .registers-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(120px, 1fr)); gap: 10px; margin-top: 15px; }
+        .register-item { padding: 15px; background: #f8f9fa; border-radius: 5px; text-align: center; border: 1px solid #e9ecef; }
+        .refresh-btn { background: #007bff; color: white; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; margin-bottom: 20px; }
+        .refresh-btn:hover { background: #0056b3; }
+        .config-btn { background: #ffc107; color: #212529; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; margin-left: 10px; }
+        .config-btn:hover { background: #e0a800; }
+        .error-section { background: #f8d7da; border: 1px solid #f5c6cb; color: #721c24; padding: 20px; border-radius: 5px; margin-bottom: 20px; }
+        .error-section h3 { margin-top: 0; color: #721c24; }
+        .error-section p { margin: 8px 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>&#x1F50C; ESP-32 PLC Monitor</h1>
+            <p>AutomationDirect CLICK PLC Interface</p>
+            '''
+
+# Digital inputs close and outputs section open
+MONITOR_OUTPUTS_HEAD = b'''
+            </div>
+        </div>
+        
+        <div class="data-section">
+            <h3>&#x1F4E4; Digital Outputs (Y000-Y015)</h3>
+            <div class="io-grid">
+                '''
+
+# Digital outputs close and registers section open
+MONITOR_REGISTERS_HEAD = b'''
+            </div>
+        </div>
+        
+        <div class="data-section">
+            <h3>&#x1F4CA; Data Registers (DS001-DS010)</h3>
+            <div class="registers-grid">
+                '''
+
+# Registers close and page close
+MONITOR_TAIL = b'''
+            </div>
+        </div>
+    </div>
+</body>
+</html>'''
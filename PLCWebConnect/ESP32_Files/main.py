@@ -8,12 +8,23 @@ import socket
 import json
 import time
 import machine
+import micropython
 import gc
-from machine import UART, Pin
+import array
+import struct
+from machine import UART, Pin, Timer
+from micropython import const
 import ujson
 import uasyncio as asyncio
 import sys
 
+try:
+    from operator import itemgetter
+    _by_rssi = itemgetter('rssi')
+except ImportError:
+    # operator is not part of every MicroPython build
+    _by_rssi = lambda net: net['rssi']
+
 # Import configuration
 try:
     from config import *
@@ -31,9 +42,12 @@ except ImportError:
     UART_PORT = 2
     BAUD_RATE = 9600
     DEVICE_ADDRESS = 1
-    UART_TIMEOUT = 1000
+    UART_CHAR_TIMEOUT = 4
     WEB_PORT = 80
     POLL_INTERVAL = 2.0
+    POLL_INPUT_COUNT = 16
+    POLL_COIL_COUNT = 16
+    POLL_REGISTER_COUNT = 10
     MAX_RETRIES = 3
     WIFI_TIMEOUT = 15
     RESPONSE_TIMEOUT = 100
@@ -41,25 +55,90 @@ except ImportError:
     AP_SUBNET = "255.255.255.0"
     AP_GATEWAY = "192.168.4.1"
     AP_DNS = "192.168.4.1"
+    LOG_LEVEL = "INFO"
+
+# Poll period in whole milliseconds, converted once instead of on every sleep
+POLL_INTERVAL_MS = int(POLL_INTERVAL * 1000)
 
-def print_log(message, level="INFO"):
-    """Simple logging without dependencies"""
-    print(f"[{level}] {message}")
+# Log level ordering, messages below LOG_LEVEL are dropped before formatting
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40}
+LOG_THRESHOLD = LOG_LEVELS.get(LOG_LEVEL, 20)
+
+def print_log(fmt, *args, level="INFO"):
+    """Simple logging without dependencies, fmt % args is only built when the level is enabled"""
+    if LOG_LEVELS.get(level, 20) < LOG_THRESHOLD:
+        return
+    print("[%s] %s" % (level, fmt % args if args else fmt))
+
+from html_pages import (
+    PORTAL_HEAD, PORTAL_NETWORKS_END, PORTAL_AP_IP, PORTAL_FREE_MEMORY, PORTAL_TAIL,
+    MONITOR_HEAD, MONITOR_OUTPUTS_HEAD, MONITOR_REGISTERS_HEAD, MONITOR_TAIL
+)
 
 try:
     from custom_scripts import create_script_engine
     SCRIPTS_AVAILABLE = True
 except ImportError:
     SCRIPTS_AVAILABLE = False
-    print_log("Custom scripts not available", "WARNING")
+    print_log("Custom scripts not available", level="WARNING")
+
+# HTTP headers and fixed responses
+# Streamed pages send an open header block, handle_client ends it with chunked framing
+# (keep-alive) or Connection: close. Fixed responses carry their own Content-Length.
+HTML_RESPONSE_HEADER = b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+JSON_ETAG_HEADER = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nETag: "
+JSON_LENGTH_HEADER = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: "
+CHUNKED_HEADER_END = b"Transfer-Encoding: chunked\r\n\r\n"
+CLOSE_HEADER_END = b"Connection: close\r\n\r\n"
+LAST_CHUNK = b"0\r\n\r\n"
+NOT_MODIFIED_HEADER = b"HTTP/1.1 304 Not Modified\r\nETag: "
+NOT_FOUND_RESPONSE = (b"HTTP/1.1 404 Not Found\r\nContent-Type: text/html\r\nContent-Length: 48\r\n\r\n"
+                      b"<html><body><h1>404 Not Found</h1></body></html>")
+NOT_FOUND_PARTS = (NOT_FOUND_RESPONSE,)
+
+def _json_response(body):
+    """Complete fixed JSON response with its Content-Length"""
+    return JSON_LENGTH_HEADER + b"%d\r\n\r\n" % len(body) + body
+
+CONNECT_FAILED_RESPONSE = _json_response(b'{"success": false, "error": "Failed to connect to network"}')
+SSID_REQUIRED_RESPONSE = _json_response(b'{"success": false, "error": "SSID is required"}')
+CONNECT_SUCCESS_HEAD = b'{"success": true, "message": "Connected successfully", "ip": "'
+CONNECT_SUCCESS_TAIL = b'"}'
+INVALID_REQUEST_HEAD = b'{"success": false, "error": '
+
+# Seconds an idle keep-alive connection waits for its next request
+KEEP_ALIVE_TIMEOUT = const(5)
+
+# Each rendered monitor grid cell fits in this many bytes
+_GRID_CELL_SIZE = const(64)
+_REGISTER_CELL_END = b'</div>'
+
+# plc_data entries holding the raw I/O buffers, rendered with names in /api/status
+_BUFFER_KEYS = ('inputs', 'coils', 'registers')
+
+# Access point details shown on the config portal
+_AP_SSID_BYTES = AP_SSID.encode('utf-8')
+_AP_IP_BYTES = AP_IP.encode('utf-8')
 
 # Operating modes
 MODE_STA = "STA"  # Station mode (connected to WiFi)
 MODE_AP = "AP"    # Access Point mode (configuration portal)
 
-def print_log(message, level="INFO"):
-    """Simple logging without dependencies"""
-    print(f"[{level}] {message}")
+# Reuse WiFi scan results for this long (ms), scan() blocks the event loop
+SCAN_CACHE_TTL = const(15000)
+# Background rescan period in AP mode, shorter than the TTL so page loads hit the cache
+SCAN_REFRESH_INTERVAL = const(10000)
+
+# Status LED patterns, stepped every LED_TICK_MS with one bit per step (LSB first)
+LED_TICK_MS = const(100)
+LED_AP_PATTERN = const(0b11111)       # 500 ms on, 1500 ms off
+LED_AP_STEPS = const(20)
+LED_OFFLINE_PATTERN = const(0b101)    # Two 100 ms flashes, then 1 s off
+LED_OFFLINE_STEPS = const(14)
+LED_LINK_CHECK_TICKS = const(20)      # Re-read the WiFi link state every 2 s
+
+# Free heap (bytes) below which the poll loop forces a full collection
+GC_LOW_WATERMARK = const(16384)
 
 def blink_pattern(led, count=1, on_time=200, off_time=200):
     """LED blink pattern for status indication"""
@@ -69,103 +148,205 @@ def blink_pattern(led, count=1, on_time=200, off_time=200):
         led.off()
         time.sleep_ms(off_time)
 
+async def sleep_until_next_poll(t0):
+    """Yield to other tasks until POLL_INTERVAL has passed since t0"""
+    dt = POLL_INTERVAL_MS - time.ticks_diff(time.ticks_ms(), t0)
+    await asyncio.sleep_ms(max(0, dt))
+
+def _build_io_cells(prefix, count):
+    """Prebuild the (off, on) monitor grid cells for one I/O block"""
+    return (
+        tuple(f'<div class="io-item io-off">{prefix}{i:03d}<br>OFF</div>'.encode('utf-8') for i in range(count)),
+        tuple(f'<div class="io-item io-on">{prefix}{i:03d}<br>ON</div>'.encode('utf-8') for i in range(count))
+    )
+
+def _build_crc_table():
+    """Precompute the Modbus CRC16 value for every byte"""
+    table = array.array('H', [0] * 256)
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table[byte] = crc
+    return table
+
+_CRC_TABLE = _build_crc_table()
+
+@micropython.viper
+def crc16(buf: ptr8, n: int) -> int:
+    """Calculate Modbus CRC16 over the first n bytes of buf"""
+    table = ptr16(_CRC_TABLE)
+    crc = 0xFFFF
+    for i in range(n):
+        crc = (crc >> 8) ^ table[(crc ^ buf[i]) & 0xFF]
+    return crc
+
+@micropython.viper
+def unpack_bits(src: ptr8, offset: int, dst: ptr8, n: int):
+    """Expand n LSB-first packed bits from src[offset:] into 0/1 bytes in dst"""
+    for i in range(n):
+        dst[i] = (src[offset + (i >> 3)] >> (i & 7)) & 1
+
 class ModbusRTU:
     """Simplified Modbus RTU implementation"""
     
     def __init__(self, uart):
         self.uart = uart
+        # Poll requests repeat every cycle, so each frame is built once
+        self._request_cache = {}
+        # Scratch frame that new requests are packed into before caching
+        self._req_buf = bytearray(8)
+        # Reply frames are read into one buffer sized for the largest RTU frame
+        self._rx_buf = bytearray(256)
+        # Scratch buffer for discarding stale bytes without touching _rx_buf
+        self._drain_buf = bytearray(32)
+        # Reused 0/1 bit buffers returned by read_coils / read_discrete_inputs
+        self._coil_bits = bytearray(0)
+        self._input_bits = bytearray(0)
         
-    def crc16(self, data):
-        """Calculate Modbus CRC16"""
-        crc = 0xFFFF
-        for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 1:
-                    crc >>= 1
-                    crc ^= 0xA001
-                else:
-                    crc >>= 1
-        return crc
-    
+    @micropython.native
     def build_request(self, slave_id, function_code, start_addr, count):
-        """Build Modbus RTU request"""
-        request = bytearray([slave_id, function_code])
-        request.extend(start_addr.to_bytes(2, 'big'))
-        request.extend(count.to_bytes(2, 'big'))
+        """Build Modbus RTU request (cached per unique frame)"""
+        key = (slave_id, function_code, start_addr, count)
+        request = self._request_cache.get(key)
+        if request is not None:
+            return request
         
-        crc = self.crc16(request)
-        request.extend(crc.to_bytes(2, 'little'))
+        buf = self._req_buf
+        struct.pack_into('>BBHH', buf, 0, slave_id, function_code, start_addr, count)
+        struct.pack_into('<H', buf, 6, crc16(buf, 6))
+        request = bytes(buf)
+        self._request_cache[key] = request
         return request
     
-    def read_coils(self, slave_id, start_addr, count):
+    def _drain_rx(self):
+        """Discard whatever is in the RX FIFO, e.g. a reply that arrived after its timeout
+        
+        Without this, stale bytes would satisfy the next transaction's length
+        check and every following reply would be read one frame late.
+        """
+        uart = self.uart
+        buf = self._drain_buf
+        available = uart.any()
+        while available:
+            uart.readinto(buf, min(available, len(buf)))
+            available = uart.any()
+    
+    def _transact(self, request, expected_len):
+        """Send a request and read its reply frame into _rx_buf
+        
+        The UART driver returns as soon as expected_len bytes arrive, or
+        after an inter-character gap (timeout_char) ends a short reply.
+        Returns the number of bytes received.
+        """
+        self._drain_rx()
+        self.uart.write(request)
+        received = self.uart.readinto(self._rx_buf, expected_len) or 0
+        self._drain_rx()
+        return received
+    
+    async def _transact_async(self, request, expected_len):
+        """Send a request and yield to other tasks until its reply arrives
+        
+        Returns once expected_len bytes are buffered, or whatever arrived
+        when RESPONSE_TIMEOUT expires (e.g. a short exception reply). The
+        reply is left in _rx_buf and its length is returned.
+        """
+        uart = self.uart
+        self._drain_rx()
+        uart.write(request)
+        start = time.ticks_ms()
+        while uart.any() < expected_len:
+            if time.ticks_diff(time.ticks_ms(), start) >= RESPONSE_TIMEOUT:
+                break
+            await asyncio.sleep_ms(2)
+        available = uart.any()
+        if not available:
+            return 0
+        received = uart.readinto(self._rx_buf, min(available, expected_len)) or 0
+        # Bytes past the expected frame are not part of this reply
+        self._drain_rx()
+        return received
+    
+    @micropython.native
+    def write_multiple_coils(self, slave_id, start_addr, values):
+        """Write multiple coils (function code 15)"""
+        try:
+            count = len(values)
+            data = bytearray((count + 7) // 8)
+            for i in range(count):
+                if values[i]:
+                    data[i // 8] |= 1 << (i % 8)
+            
+            request = bytearray([slave_id, 0x0F])
+            request.extend(start_addr.to_bytes(2, 'big'))
+            request.extend(count.to_bytes(2, 'big'))
+            request.append(len(data))
+            request.extend(data)
+            crc = crc16(request, len(request))
+            request.extend(crc.to_bytes(2, 'little'))
+            
+            received = self._transact(request, 8)
+            response = self._rx_buf
+            return (received >= 8 and
+                    response[0] == slave_id and response[1] == 0x0F)
+        except Exception as e:
+            print_log("Error writing coils: %s", e, level="ERROR")
+            return False
+    
+    async def read_coils(self, slave_id, start_addr, count):
         """Read coils (function code 1)"""
         try:
             request = self.build_request(slave_id, 0x01, start_addr, count)
-            self.uart.write(request)
-            time.sleep_ms(100)
-            
-            response = self.uart.read()
-            if response and len(response) >= 5:
+            data_len = (count + 7) // 8
+            received = await self._transact_async(request, 5 + data_len)
+            response = self._rx_buf
+            if received >= 3 + data_len:
                 if response[0] == slave_id and response[1] == 0x01:
-                    byte_count = response[2]
-                    data_bytes = response[3:3+byte_count]
-                    
-                    bits = []
-                    for byte_val in data_bytes:
-                        for i in range(8):
-                            if len(bits) < count:
-                                bits.append(bool(byte_val & (1 << i)))
-                    return bits[:count]
+                    if len(self._coil_bits) != count:
+                        self._coil_bits = bytearray(count)
+                    unpack_bits(response, 3, self._coil_bits, count)
+                    return self._coil_bits
             return None
         except Exception as e:
-            print_log(f"Error reading coils: {e}", "ERROR")
+            print_log("Error reading coils: %s", e, level="ERROR")
             return None
     
-    def read_discrete_inputs(self, slave_id, start_addr, count):
+    async def read_discrete_inputs(self, slave_id, start_addr, count):
         """Read discrete inputs (function code 2)"""
         try:
             request = self.build_request(slave_id, 0x02, start_addr, count)
-            self.uart.write(request)
-            time.sleep_ms(100)
-            
-            response = self.uart.read()
-            if response and len(response) >= 5:
+            data_len = (count + 7) // 8
+            received = await self._transact_async(request, 5 + data_len)
+            response = self._rx_buf
+            if received >= 3 + data_len:
                 if response[0] == slave_id and response[1] == 0x02:
-                    byte_count = response[2]
-                    data_bytes = response[3:3+byte_count]
-                    
-                    bits = []
-                    for byte_val in data_bytes:
-                        for i in range(8):
-                            if len(bits) < count:
-                                bits.append(bool(byte_val & (1 << i)))
-                    return bits[:count]
+                    if len(self._input_bits) != count:
+                        self._input_bits = bytearray(count)
+                    unpack_bits(response, 3, self._input_bits, count)
+                    return self._input_bits
             return None
         except Exception as e:
-            print_log(f"Error reading inputs: {e}", "ERROR")
+            print_log("Error reading inputs: %s", e, level="ERROR")
             return None
     
-    def read_holding_registers(self, slave_id, start_addr, count):
+    async def read_holding_registers(self, slave_id, start_addr, count):
         """Read holding registers (function code 3)"""
         try:
             request = self.build_request(slave_id, 0x03, start_addr, count)
-            self.uart.write(request)
-            time.sleep_ms(100)
-            
-            response = self.uart.read()
-            if response and len(response) >= 5:
+            received = await self._transact_async(request, 5 + 2 * count)
+            response = self._rx_buf
+            if received >= 5:
                 if response[0] == slave_id and response[1] == 0x03:
                     byte_count = response[2]
-                    if len(response) >= 3 + byte_count + 2:
-                        registers = []
-                        for i in range(0, byte_count, 2):
-                            reg_val = (response[3+i] << 8) | response[3+i+1]
-                            registers.append(reg_val)
-                        return registers
+                    if received >= 3 + byte_count + 2:
+                        return struct.unpack_from('>%dH' % (byte_count // 2), response, 3)
             return None
         except Exception as e:
-            print_log(f"Error reading registers: {e}", "ERROR")
+            print_log("Error reading registers: %s", e, level="ERROR")
             return None
 
 class ESP32PLCBridge:
@@ -192,25 +373,41 @@ class ESP32PLCBridge:
                 baudrate=BAUD_RATE,
                 tx=UART_TX_PIN,
                 rx=UART_RX_PIN,
-                timeout=UART_TIMEOUT
+                timeout=RESPONSE_TIMEOUT,
+                timeout_char=UART_CHAR_TIMEOUT
             )
             self.modbus = ModbusRTU(self.uart)
             print_log("UART initialized successfully")
         except Exception as e:
             self.uart_error = str(e)
-            print_log(f"UART initialization failed: {e}", "WARNING")
-            print_log("Web server will start anyway - PLC connection can be retried later", "INFO")
+            print_log(f"UART initialization failed: {e}", level="WARNING")
+            print_log("Web server will start anyway - PLC connection can be retried later", level="INFO")
+        
+        # Polled PLC values in fixed buffers, names are only formatted for output
+        self._inputs = bytearray(POLL_INPUT_COUNT)
+        self._coils = bytearray(POLL_COIL_COUNT)
+        self._regs = array.array('H', bytes(2 * POLL_REGISTER_COUNT))
+        
+        # Every possible I/O cell (off, on) and register cell opening, prebuilt once,
+        # plus a scratch buffer the grids are rendered into
+        self._input_cells = _build_io_cells('X', POLL_INPUT_COUNT)
+        self._coil_cells = _build_io_cells('Y', POLL_COIL_COUNT)
+        self._register_cells = tuple(
+            f'<div class="register-item"><strong>DS{i+1:03d}</strong><br>'.encode('utf-8')
+            for i in range(POLL_REGISTER_COUNT)
+        )
+        self._html_buf = bytearray(_GRID_CELL_SIZE * max(POLL_INPUT_COUNT, POLL_COIL_COUNT, POLL_REGISTER_COUNT))
+        self._html_mv = memoryview(self._html_buf)
         
         # PLC data storage
         self.plc_data = {
             'connected': False,
             'last_update': 0,
             'communication_errors': 0,
-            'digital_inputs': {},
-            'digital_outputs': {},
-            'input_status': {},
-            'coil_status': {},
-            'data_registers': {},
+            'version': 0,
+            'inputs': self._inputs,
+            'coils': self._coils,
+            'registers': self._regs,
             'system_info': {
                 'device': 'ESP-32 PLC Bridge',
                 'plc_model': 'AutomationDirect CLICK',
@@ -219,22 +416,43 @@ class ESP32PLCBridge:
                 'baud_rate': BAUD_RATE
             }
         }
+        # Body timestamp and free memory of the current status version, see _stamp_status
+        self._status_time = time.time()
+        self._status_free_memory = gc.mem_free()
         
         # Initialize script engine if available
         self.script_engine = None
         if SCRIPTS_AVAILABLE:
             try:
-                self.script_engine = create_script_engine(self.modbus)
-                print_log("Custom scripts initialized", "INFO")
+                self.script_engine = create_script_engine(self.modbus, DEVICE_ADDRESS)
+                print_log("Custom scripts initialized", level="INFO")
             except Exception as e:
-                print_log(f"Script engine init failed: {e}", "ERROR")
+                print_log(f"Script engine init failed: {e}", level="ERROR")
+        
+        
+        # GET routes keyed by request path
+        self._get_routes = {
+            b'/': self._handle_root,
+            b'/config': self._handle_config,
+            b'/api/status': self._handle_status,
+            b'/api/networks': self._handle_networks
+        }
+        
+        # Cached WiFi scan results
+        self._scan_cache = None
+        self._scan_ts = 0
+        # (network list, encoded /api/networks response) so repeat requests skip dumps/encode
+        self._scan_json = (None, ())
+        
+        # Collect after a quarter of the free heap is allocated rather than on every poll
+        gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
         
         self.running = False
     
     def try_wifi_connection(self):
         """Attempt to connect to configured WiFi"""
         if WIFI_SSID == "YOUR_WIFI_SSID" or not WIFI_SSID:
-            print_log("No WiFi credentials configured", "WARN")
+            print_log("No WiFi credentials configured", level="WARN")
             return False
         
         print_log(f"Attempting WiFi connection to {WIFI_SSID}")
@@ -263,7 +481,7 @@ class ESP32PLCBridge:
             self.status_led.on()
             return True
         else:
-            print_log("WiFi connection failed", "WARN")
+            print_log("WiFi connection failed", level="WARN")
             return False
     
     def start_access_point(self):
@@ -296,8 +514,13 @@ class ESP32PLCBridge:
         blink_pattern(self.status_led, 3, 200, 200)
         return True
     
-    def scan_networks(self):
-        """Scan for available WiFi networks"""
+    @micropython.native
+    def scan_networks(self, force=False):
+        """Scan for available WiFi networks, reusing recent results unless forced"""
+        if (not force and self._scan_cache
+                and time.ticks_diff(time.ticks_ms(), self._scan_ts) < SCAN_CACHE_TTL):
+            return self._scan_cache
+        
         try:
             if not self.sta_if.active():
                 self.sta_if.active(True)
@@ -305,27 +528,32 @@ class ESP32PLCBridge:
             
             networks = self.sta_if.scan()
             network_list = []
+            seen = set()
             
             for net in networks:
                 ssid = net[0].decode('utf-8')
-                rssi = net[3]
-                auth = net[4]
                 
                 # Filter out empty SSIDs and duplicates
-                if ssid and not any(n['ssid'] == ssid for n in network_list):
-                    network_list.append({
-                        'ssid': ssid,
-                        'rssi': rssi,
-                        'auth': auth,
-                        'secure': auth > 0
-                    })
+                if not ssid or ssid in seen:
+                    continue
+                seen.add(ssid)
+                
+                auth = net[4]
+                network_list.append({
+                    'ssid': ssid,
+                    'rssi': net[3],
+                    'auth': auth,
+                    'secure': auth > 0
+                })
             
             # Sort by signal strength
-            network_list.sort(key=lambda x: x['rssi'], reverse=True)
-            return network_list[:20]  # Return top 20 networks
+            network_list.sort(key=_by_rssi, reverse=True)
+            self._scan_cache = network_list[:20]  # Keep top 20 networks
+            self._scan_ts = time.ticks_ms()
+            return self._scan_cache
             
         except Exception as e:
-            print_log(f"Network scan failed: {e}", "ERROR")
+            print_log("Network scan failed: %s", e, level="ERROR")
             return []
     
     def save_wifi_credentials(self, ssid, password):
@@ -358,10 +586,10 @@ class ESP32PLCBridge:
             self.status_led.on()
             return True
         else:
-            print_log("New WiFi connection failed", "ERROR")
+            print_log("New WiFi connection failed", level="ERROR")
             return False
     
-    def poll_plc_data(self):
+    async def poll_plc_data(self):
         """Poll data from PLC (non-blocking)"""
         # Always update system status first
         self.plc_data['system_info']['uart_status'] = 'OK' if self.uart else 'Failed'
@@ -373,37 +601,27 @@ class ESP32PLCBridge:
             return False
             
         try:
+            # Buffers are only rewritten when a value differs from the last poll
             # Read digital inputs (X000-X015)
-            inputs = self.modbus.read_discrete_inputs(DEVICE_ADDRESS, 0, 16)
+            inputs = await self.modbus.read_discrete_inputs(DEVICE_ADDRESS, 0, POLL_INPUT_COUNT)
             if inputs:
-                self.plc_data['input_status'] = {
-                    f'X{i:03d}': inputs[i] for i in range(len(inputs))
-                }
-                self.plc_data['digital_inputs'] = {
-                    i+1: inputs[i] for i in range(len(inputs))
-                }
+                if inputs != self._inputs:
+                    self._inputs[:] = inputs
                 self.plc_data['connected'] = True
                 self.plc_data['connection_error'] = None
             
             # Read digital outputs/coils (Y000-Y015)
-            coils = self.modbus.read_coils(DEVICE_ADDRESS, 0, 16)
-            if coils:
-                self.plc_data['coil_status'] = {
-                    f'Y{i:03d}': coils[i] for i in range(len(coils))
-                }
-                self.plc_data['digital_outputs'] = {
-                    i+1: coils[i] for i in range(len(coils))
-                }
+            coils = await self.modbus.read_coils(DEVICE_ADDRESS, 0, POLL_COIL_COUNT)
+            if coils and coils != self._coils:
+                self._coils[:] = coils
             
             # Read holding registers (DS001-DS010)
-            registers = self.modbus.read_holding_registers(DEVICE_ADDRESS, 0, 10)
+            registers = await self.modbus.read_holding_registers(DEVICE_ADDRESS, 0, POLL_REGISTER_COUNT)
             if registers:
-                self.plc_data['data_registers'] = {
-                    f'DS{i+1:03d}': registers[i] for i in range(len(registers))
-                }
-                # Also provide numbered format for scripts
-                for i, val in enumerate(registers):
-                    self.plc_data['data_registers'][i+1] = val
+                regs = self._regs
+                for i in range(min(len(registers), len(regs))):
+                    if regs[i] != registers[i]:
+                        regs[i] = registers[i]
             
             self.plc_data['last_update'] = time.time()
             
@@ -413,7 +631,7 @@ class ESP32PLCBridge:
                     script_results = self.script_engine.execute_enabled_scripts(self.plc_data)
                     self.plc_data['script_results'] = script_results
                 except Exception as e:
-                    print_log(f"Script execution error: {e}", "ERROR")
+                    print_log("Script execution error: %s", e, level="ERROR")
             
             if inputs or coils or registers:
                 return True
@@ -422,14 +640,51 @@ class ESP32PLCBridge:
                 return False
                 
         except Exception as e:
-            print_log(f"PLC polling error: {e}", "ERROR")
+            print_log("PLC polling error: %s", e, level="ERROR")
             self.plc_data['communication_errors'] += 1
             self.plc_data['connected'] = False
             self.plc_data['connection_error'] = str(e)
             return False
     
-    def create_config_portal_html(self):
-        """Create HTML for WiFi configuration portal"""
+    def _stamp_status(self):
+        """Start a new /api/status version, the version doubles as the response's ETag"""
+        # Every poll rewrites last_update and the script results, so every poll is a new version.
+        # The body's timestamp and free memory are sampled here too, a 304 then never hides a newer body
+        self.plc_data['version'] += 1
+        self._status_time = time.time()
+        self._status_free_memory = gc.mem_free()
+    
+    def iter_status_json(self, now, free_memory):
+        """Yield the /api/status body as JSON byte chunks, one data section at a time"""
+        yield b'{"success": true, "mode": '
+        yield ujson.dumps(self.operating_mode).encode('utf-8')
+        yield b', "data": {'
+        for key, value in self.plc_data.items():
+            if key not in _BUFFER_KEYS:
+                yield f'"{key}": {ujson.dumps(value)}, '.encode('utf-8')
+        yield b'"input_status": '
+        yield self._json_bits('X', self._inputs)
+        yield b', "coil_status": '
+        yield self._json_bits('Y', self._coils)
+        yield b', "data_registers": '
+        yield self._json_registers()
+        yield f'}}, "timestamp": {now}, "free_memory": {free_memory}}}'.encode('utf-8')
+    
+    @micropython.native
+    def _json_bits(self, prefix, values):
+        """Encode a bit buffer as a JSON object of named booleans"""
+        items = [f'"{prefix}{i:03d}": {"true" if v else "false"}' for i, v in enumerate(values)]
+        return ('{' + ', '.join(items) + '}').encode('utf-8')
+    
+    @micropython.native
+    def _json_registers(self):
+        """Encode the register buffer as a JSON object of named values"""
+        items = [f'"DS{i+1:03d}": {v}' for i, v in enumerate(self._regs)]
+        return ('{' + ', '.join(items) + '}').encode('utf-8')
+    
+    def iter_config_portal_chunks(self, free_memory):
+        """Yield the WiFi configuration portal HTML as byte chunks"""
+        yield PORTAL_HEAD
         networks = self.scan_networks()
         
         network_options = ""
@@ -443,192 +698,18 @@ class ESP32PLCBridge:
                 </div>
             '''
         
-        html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>ESP-32 PLC Bridge - WiFi Setup</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; background: #f0f0f0; }}
-        .container {{ max-width: 500px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.1); }}
-        .header {{ text-align: center; margin-bottom: 30px; }}
-        .header h1 {{ color: #333; margin-bottom: 10px; }}
-        .header p {{ color: #666; }}
-        .section {{ margin-bottom: 25px; }}
-        .section h3 {{ color: #333; margin-bottom: 15px; }}
-        .network-list {{ max-height: 300px; overflow-y: auto; border: 1px solid #ddd; border-radius: 5px; }}
-        .network-item {{ padding: 15px; border-bottom: 1px solid #eee; cursor: pointer; display: flex; justify-content: space-between; align-items: center; }}
-        .network-item:hover {{ background: #f8f9fa; }}
-        .network-item.selected {{ background: #007bff; color: white; }}
-        .network-name {{ font-weight: bold; }}
-        .network-signal {{ font-size: 12px; color: #666; }}
-        .network-item.selected .network-signal {{ color: #ccc; }}
-        .form-group {{ margin-bottom: 15px; }}
-        .form-group label {{ display: block; margin-bottom: 5px; font-weight: bold; color: #333; }}
-        .form-group input {{ width: 100%; padding: 12px; border: 1px solid #ddd; border-radius: 5px; font-size: 16px; }}
-        .btn {{ background: #007bff; color: white; padding: 12px 30px; border: none; border-radius: 5px; cursor: pointer; font-size: 16px; width: 100%; }}
-        .btn:hover {{ background: #0056b3; }}
-        .btn:disabled {{ background: #ccc; cursor: not-allowed; }}
-        .status {{ padding: 10px; margin: 15px 0; border-radius: 5px; text-align: center; }}
-        .status.success {{ background: #d4edda; color: #155724; border: 1px solid #c3e6cb; }}
-        .status.error {{ background: #f8d7da; color: #721c24; border: 1px solid #f5c6cb; }}
-        .hidden {{ display: none; }}
-        .refresh-btn {{ background: #28a745; margin-bottom: 15px; }}
-        .refresh-btn:hover {{ background: #218838; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🔧 ESP-32 PLC Bridge</h1>
-            <p>WiFi Configuration Portal</p>
-        </div>
-        
-        <div class="section">
-            <h3>📡 Available Networks</h3>
-            <button class="btn refresh-btn" onclick="refreshNetworks()">🔄 Refresh Networks</button>
-            <div class="network-list" id="networkList">
-                {network_options}
-            </div>
-        </div>
-        
-        <div class="section">
-            <h3>🔑 WiFi Credentials</h3>
-            <form id="wifiForm" onsubmit="connectWifi(event)">
-                <div class="form-group">
-                    <label for="ssid">Network Name (SSID):</label>
-                    <input type="text" id="ssid" name="ssid" required>
-                </div>
-                <div class="form-group" id="passwordGroup">
-                    <label for="password">Password:</label>
-                    <input type="password" id="password" name="password">
-                </div>
-                <button type="submit" class="btn" id="connectBtn">🔗 Connect to WiFi</button>
-            </form>
-        </div>
-        
-        <div id="status" class="status hidden"></div>
-        
-        <div class="section">
-            <h3>ℹ️ Device Information</h3>
-            <p><strong>Device:</strong> ESP-32 PLC Bridge</p>
-            <p><strong>Access Point:</strong> {AP_SSID}</p>
-            <p><strong>IP Address:</strong> {AP_IP}</p>
-            <p><strong>Free Memory:</strong> {gc.mem_free()} bytes</p>
-        </div>
-    </div>
+        yield network_options.encode('utf-8')
+        yield PORTAL_NETWORKS_END
+        yield _AP_SSID_BYTES
+        yield PORTAL_AP_IP
+        yield _AP_IP_BYTES
+        yield PORTAL_FREE_MEMORY
+        yield str(free_memory).encode('utf-8')
+        yield PORTAL_TAIL
     
-    <script>
-        let selectedNetwork = null;
-        
-        function selectNetwork(ssid, secure) {{
-            // Remove previous selection
-            document.querySelectorAll('.network-item').forEach(item => {{
-                item.classList.remove('selected');
-            }});
-            
-            // Select clicked network
-            event.currentTarget.classList.add('selected');
-            selectedNetwork = {{ssid: ssid, secure: secure}};
-            
-            // Fill form
-            document.getElementById('ssid').value = ssid;
-            
-            // Show/hide password field
-            const passwordGroup = document.getElementById('passwordGroup');
-            if (secure) {{
-                passwordGroup.style.display = 'block';
-                document.getElementById('password').required = true;
-            }} else {{
-                passwordGroup.style.display = 'none';
-                document.getElementById('password').required = false;
-                document.getElementById('password').value = '';
-            }}
-        }}
-        
-        function refreshNetworks() {{
-            window.location.reload();
-        }}
-        
-        function showStatus(message, type) {{
-            const status = document.getElementById('status');
-            status.textContent = message;
-            status.className = 'status ' + type;
-            status.classList.remove('hidden');
-        }}
-        
-        function connectWifi(event) {{
-            event.preventDefault();
-            
-            const ssid = document.getElementById('ssid').value;
-            const password = document.getElementById('password').value;
-            const connectBtn = document.getElementById('connectBtn');
-            
-            if (!ssid) {{
-                showStatus('Please select or enter a network name', 'error');
-                return;
-            }}
-            
-            connectBtn.disabled = true;
-            connectBtn.textContent = '🔄 Connecting...';
-            showStatus('Attempting to connect to ' + ssid + '...', 'info');
-            
-            fetch('/connect', {{
-                method: 'POST',
-                headers: {{'Content-Type': 'application/json'}},
-                body: JSON.stringify({{ssid: ssid, password: password}})
-            }})
-            .then(response => response.json())
-            .then(data => {{
-                if (data.success) {{
-                    showStatus('Connected successfully! Switching to station mode...', 'success');
-                    setTimeout(() => {{
-                        window.location.href = 'http://' + data.ip;
-                    }}, 3000);
-                }} else {{
-                    showStatus('Connection failed: ' + data.error, 'error');
-                    connectBtn.disabled = false;
-                    connectBtn.textContent = '🔗 Connect to WiFi';
-                }}
-            }})
-            .catch(error => {{
-                showStatus('Connection error: ' + error, 'error');
-                connectBtn.disabled = false;
-                connectBtn.textContent = '🔗 Connect to WiFi';
-            }});
-        }}
-    </script>
-</body>
-</html>'''
-        return html
-    
-    def create_plc_monitor_html(self):
-        """Create HTML for PLC monitoring interface"""
-        # Digital inputs
-        inputs_html = ""
-        for i in range(16):
-            addr = f'X{i:03d}'
-            value = self.plc_data['input_status'].get(addr, False)
-            class_name = "io-on" if value else "io-off"
-            status = "ON" if value else "OFF"
-            inputs_html += f'<div class="io-item {class_name}">{addr}<br>{status}</div>'
-        
-        # Digital outputs
-        outputs_html = ""
-        for i in range(16):
-            addr = f'Y{i:03d}'
-            value = self.plc_data['coil_status'].get(addr, False)
-            class_name = "io-on" if value else "io-off"
-            status = "ON" if value else "OFF"
-            outputs_html += f'<div class="io-item {class_name}">{addr}<br>{status}</div>'
-        
-        # Data registers
-        registers_html = ""
-        for i in range(10):
-            addr = f'DS{i+1:03d}'
-            value = self.plc_data['data_registers'].get(addr, 0)
-            registers_html += f'<div class="register-item"><strong>{addr}</strong><br>{value}</div>'
+    def iter_monitor_chunks(self, now, free_memory):
+        """Yield the PLC monitoring interface HTML as byte chunks"""
+        yield MONITOR_HEAD
         
         # Status and error information
         status_class = "connected" if self.plc_data['connected'] else "disconnected"
@@ -654,47 +735,11 @@ class ESP32PLCBridge:
         # Last update
         last_update = self.plc_data['last_update']
         if last_update:
-            update_str = f"{int(time.time() - last_update)}s ago"
+            update_str = f"{int(now - last_update)}s ago"
         else:
             update_str = "Never"
         
-        html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>ESP-32 PLC Monitor</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background: #f0f0f0; }}
-        .container {{ max-width: 1000px; margin: 0 auto; }}
-        .header {{ background: #007bff; color: white; padding: 20px; border-radius: 5px; margin-bottom: 20px; text-align: center; }}
-        .mode-badge {{ background: rgba(255,255,255,0.2); padding: 5px 10px; border-radius: 15px; font-size: 12px; }}
-        .status {{ display: flex; gap: 15px; margin-bottom: 20px; flex-wrap: wrap; }}
-        .status-card {{ background: white; padding: 20px; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); flex: 1; min-width: 200px; text-align: center; }}
-        .connected {{ color: #28a745; }}
-        .disconnected {{ color: #dc3545; }}
-        .data-section {{ background: white; padding: 20px; border-radius: 5px; margin-bottom: 15px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .io-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(80px, 1fr)); gap: 10px; margin-top: 15px; }}
-        .io-item {{ padding: 12px; border: 2px solid #ddd; border-radius: 5px; text-align: center; font-size: 12px; font-weight: bold; }}
-        .io-on {{ background: #d4edda; border-color: #28a745; color: #155724; }}
-        .io-off {{ background: #f8d7da; border-color: #dc3545; color: #721c24; }}
-        .registers-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(120px, 1fr)); gap: 10px; margin-top: 15px; }}
-        .register-item {{ padding: 15px; background: #f8f9fa; border-radius: 5px; text-align: center; border: 1px solid #e9ecef; }}
-        .refresh-btn {{ background: #007bff; color: white; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; margin-bottom: 20px; }}
-        .refresh-btn:hover {{ background: #0056b3; }}
-        .config-btn {{ background: #ffc107; color: #212529; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; margin-left: 10px; }}
-        .config-btn:hover {{ background: #e0a800; }}
-        .error-section {{ background: #f8d7da; border: 1px solid #f5c6cb; color: #721c24; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-        .error-section h3 {{ margin-top: 0; color: #721c24; }}
-        .error-section p {{ margin: 8px 0; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🔌 ESP-32 PLC Monitor</h1>
-            <p>AutomationDirect CLICK PLC Interface</p>
-            <span class="mode-badge">Mode: {self.operating_mode} | IP: {self.plc_data['system_info'].get('ip_address', 'Unknown')}</span>
+        html = f'''<span class="mode-badge">Mode: {self.operating_mode} | IP: {self.plc_data['system_info'].get('ip_address', 'Unknown')}</span>
         </div>
         
         <div style="text-align: center; margin-bottom: 20px;">
@@ -717,7 +762,7 @@ class ESP32PLCBridge:
             </div>
             <div class="status-card">
                 <h4>Free Memory</h4>
-                <div>{gc.mem_free()} bytes</div>
+                <div>{free_memory} bytes</div>
             </div>
         </div>
         
@@ -726,142 +771,201 @@ class ESP32PLCBridge:
         <div class="data-section">
             <h3>📥 Digital Inputs (X000-X015)</h3>
             <div class="io-grid">
-                {inputs_html}
-            </div>
-        </div>
+                '''
+        yield html.encode('utf-8')
         
-        <div class="data-section">
-            <h3>📤 Digital Outputs (Y000-Y015)</h3>
-            <div class="io-grid">
-                {outputs_html}
-            </div>
-        </div>
+        # Digital inputs and outputs
+        yield self._render_io_cells(self._input_cells, self._inputs)
+        yield MONITOR_OUTPUTS_HEAD
+        yield self._render_io_cells(self._coil_cells, self._coils)
+        yield MONITOR_REGISTERS_HEAD
         
-        <div class="data-section">
-            <h3>📊 Data Registers (DS001-DS010)</h3>
-            <div class="registers-grid">
-                {registers_html}
-            </div>
-        </div>
-    </div>
-</body>
-</html>'''
-        return html
+        # Data registers
+        yield self._render_register_cells()
+        yield MONITOR_TAIL
     
-    async def handle_client(self, reader, writer):
-        """Handle HTTP client requests"""
+    # Cell rendering lives outside the generator, the native emitter does not compile generators.
+    # Both renderers fill the shared _html_buf and return a view of it, which the
+    # caller sends and drains before the next grid is rendered.
+    @micropython.native
+    def _render_io_cells(self, cells, values):
+        """Render one digital I/O grid into the HTML scratch buffer"""
+        off_cells, on_cells = cells
+        mv = self._html_mv
+        pos = 0
+        for i in range(len(values)):
+            cell = on_cells[i] if values[i] else off_cells[i]
+            n = len(cell)
+            mv[pos:pos + n] = cell
+            pos += n
+        return mv[:pos]
+    
+    @micropython.native
+    def _render_register_cells(self):
+        """Render the data register grid into the HTML scratch buffer"""
+        mv = self._html_mv
+        heads = self._register_cells
+        regs = self._regs
+        pos = 0
+        for i in range(len(regs)):
+            head = heads[i]
+            value = str(regs[i]).encode('utf-8')
+            n = len(head)
+            mv[pos:pos + n] = head
+            pos += n
+            n = len(value)
+            mv[pos:pos + n] = value
+            pos += n
+            n = len(_REGISTER_CELL_END)
+            mv[pos:pos + n] = _REGISTER_CELL_END
+            pos += n
+        return mv[:pos]
+    
+    def _handle_root(self, query, body, etag):
+        """Main PLC monitor page (config portal in AP mode)"""
+        yield HTML_RESPONSE_HEADER
+        if self.operating_mode == MODE_AP:
+            yield from self.iter_config_portal_chunks(gc.mem_free())
+        else:
+            yield from self.iter_monitor_chunks(time.time(), gc.mem_free())
+    
+    def _handle_config(self, query, body, etag):
+        """WiFi configuration page (always show portal)"""
+        yield HTML_RESPONSE_HEADER
+        yield from self.iter_config_portal_chunks(gc.mem_free())
+    
+    def _handle_status(self, query, body, etag):
+        """JSON status API, answers 304 while the PLC data version is unchanged"""
+        version_tag = b'"%d"' % self.plc_data['version']
+        if etag == version_tag:
+            return (NOT_MODIFIED_HEADER, version_tag, b"\r\n\r\n")
+        return self._iter_status_response(version_tag)
+    
+    def _iter_status_response(self, version_tag):
+        """Stream a 200 status response tagged with the PLC data version"""
+        yield JSON_ETAG_HEADER + version_tag + b"\r\n"
+        yield from self.iter_status_json(self._status_time, self._status_free_memory)
+    
+    def _handle_networks(self, query, body, etag):
+        """Network scan API, ?force=1 bypasses the scan cache"""
+        networks = self.scan_networks(b'force=1' in query)
+        cached_networks, response = self._scan_json
+        if cached_networks is not networks:
+            response = (_json_response(ujson.dumps({'success': True, 'networks': networks}).encode('utf-8')),)
+            self._scan_json = (networks, response)
+        return response
+    
+    def _handle_connect(self, query, body, etag):
+        """WiFi connection endpoint"""
         try:
-            request = await reader.read(2048)
-            request_str = request.decode('utf-8')
+            json_data = ujson.loads(body)
             
-            # Parse request path
-            if 'GET /' in request_str and 'GET /config' not in request_str and 'GET /api' not in request_str:
-                # Main PLC monitor page
-                if self.operating_mode == MODE_AP:
-                    html_content = self.create_config_portal_html()
-                else:
-                    html_content = self.create_plc_monitor_html()
-                
-                response = f"""HTTP/1.1 200 OK\r
-Content-Type: text/html\r
-Connection: close\r
-\r
-{html_content}"""
+            ssid = json_data.get('ssid', '')
+            password = json_data.get('password', '')
             
-            elif 'GET /config' in request_str:
-                # WiFi configuration page (always show portal)
-                html_content = self.create_config_portal_html()
-                response = f"""HTTP/1.1 200 OK\r
-Content-Type: text/html\r
-Connection: close\r
-\r
-{html_content}"""
+            if not ssid:
+                return (SSID_REQUIRED_RESPONSE,)
+            if not self.save_wifi_credentials(ssid, password):
+                return (CONNECT_FAILED_RESPONSE,)
             
-            elif 'GET /api/status' in request_str:
-                # JSON API response
-                response_data = {
-                    'success': True,
-                    'mode': self.operating_mode,
-                    'data': self.plc_data,
-                    'timestamp': time.time(),
-                    'free_memory': gc.mem_free()
-                }
-                
-                response = f"""HTTP/1.1 200 OK\r
-Content-Type: application/json\r
-Connection: close\r
-\r
-{ujson.dumps(response_data)}"""
+            # Dotted-quad IP needs no JSON escaping
+            ip = self.sta_if.ifconfig()[0].encode()
+            length = len(CONNECT_SUCCESS_HEAD) + len(ip) + len(CONNECT_SUCCESS_TAIL)
+            return (JSON_LENGTH_HEADER + b"%d\r\n\r\n" % length, CONNECT_SUCCESS_HEAD, ip, CONNECT_SUCCESS_TAIL)
             
-            elif 'GET /api/networks' in request_str:
-                # Network scan API
-                networks = self.scan_networks()
-                response_data = {
-                    'success': True,
-                    'networks': networks
-                }
+        except Exception as e:
+            # Only the exception text is free-form, so only it goes through ujson
+            error = ujson.dumps(f'Invalid request: {str(e)}').encode()
+            return (_json_response(INVALID_REQUEST_HEAD + error + b'}'),)
+    
+    async def handle_client(self, reader, writer):
+        """Handle HTTP client requests, serving further requests on the same connection while keep-alive holds"""
+        try:
+            while True:
+                # Dispatch on the request line, headers are only scanned for what the handlers need
+                request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                if not request_line:
+                    break
+                method, path, version = request_line.split(b' ', 2)
+                query = b''
+                q = path.find(b'?')
+                if q >= 0:
+                    path, query = path[:q], path[q + 1:]
                 
-                response = f"""HTTP/1.1 200 OK\r
-Content-Type: application/json\r
-Connection: close\r
-\r
-{ujson.dumps(response_data)}"""
-            
-            elif 'POST /connect' in request_str:
-                # WiFi connection endpoint
-                try:
-                    # Extract JSON data from POST body
-                    body_start = request_str.find('\r\n\r\n') + 4
-                    json_data = ujson.loads(request_str[body_start:])
-                    
-                    ssid = json_data.get('ssid', '')
-                    password = json_data.get('password', '')
-                    
-                    if ssid:
-                        success = self.save_wifi_credentials(ssid, password)
-                        if success:
-                            ip_address = self.sta_if.ifconfig()[0]
-                            response_data = {
-                                'success': True,
-                                'message': 'Connected successfully',
-                                'ip': ip_address
-                            }
-                        else:
-                            response_data = {
-                                'success': False,
-                                'error': 'Failed to connect to network'
-                            }
-                    else:
-                        response_data = {
-                            'success': False,
-                            'error': 'SSID is required'
-                        }
-                    
-                except Exception as e:
-                    response_data = {
-                        'success': False,
-                        'error': f'Invalid request: {str(e)}'
-                    }
+                # HTTP/1.1 connections stay open unless the client asks to close
+                keep_alive = version.startswith(b'HTTP/1.1')
+                content_length = 0
+                etag = None
+                while True:
+                    line = await reader.readline()
+                    if not line or line == b'\r\n':
+                        break
+                    name = line[:15].lower()
+                    if name == b'content-length:':
+                        content_length = int(line[15:])
+                    elif name[:14] == b'if-none-match:':
+                        etag = line[14:].strip()
+                    elif name[:11] == b'connection:' and b'close' in line.lower():
+                        keep_alive = False
                 
-                response = f"""HTTP/1.1 200 OK\r
-Content-Type: application/json\r
-Connection: close\r
-\r
-{ujson.dumps(response_data)}"""
-            
-            else:
-                # 404 Not Found
-                response = """HTTP/1.1 404 Not Found\r
-Content-Type: text/html\r
-Connection: close\r
-\r
-<html><body><h1>404 Not Found</h1></body></html>"""
-            
-            await writer.awrite(response.encode('utf-8'))
-            await writer.aclose()
+                body = b''
+                handler = None
+                if method == b'GET':
+                    handler = self._get_routes.get(path)
+                    if handler is None and not path.startswith(b'/api'):
+                        # Any other page shows the main page (captive portal friendly)
+                        handler = self._handle_root
+                elif method == b'POST' and path == b'/connect':
+                    handler = self._handle_connect
+                    if content_length:
+                        body = await reader.readexactly(content_length)
+                        content_length = 0
+                
+                # Skip any body no handler reads, it would otherwise be parsed as the next request
+                while content_length:
+                    skipped = await reader.read(min(content_length, 256))
+                    if not skipped:
+                        break
+                    content_length -= len(skipped)
+                
+                if handler is None:
+                    response_parts = NOT_FOUND_PARTS
+                else:
+                    response_parts = handler(query, body, etag)
+                
+                if isinstance(response_parts, tuple):
+                    # Complete response with a Content-Length
+                    for part in response_parts:
+                        writer.write(part)
+                    await writer.drain()
+                else:
+                    # Streamed response, each chunk is sent before the next section is rendered
+                    header = True
+                    for part in response_parts:
+                        if header:
+                            writer.write(part)
+                            writer.write(CHUNKED_HEADER_END if keep_alive else CLOSE_HEADER_END)
+                            header = False
+                        elif not keep_alive:
+                            writer.write(part)
+                        elif part:
+                            writer.write(b"%x\r\n" % len(part))
+                            writer.write(part)
+                            writer.write(b"\r\n")
+                        await writer.drain()
+                    if keep_alive:
+                        writer.write(LAST_CHUNK)
+                        await writer.drain()
+                
+                if not keep_alive:
+                    break
             
+        except asyncio.TimeoutError:
+            # Idle keep-alive connection
+            pass
         except Exception as e:
-            print_log(f"Client handling error: {e}", "ERROR")
+            print_log("Client handling error: %s", e, level="ERROR")
+        finally:
             try:
                 await writer.aclose()
             except:
@@ -890,41 +994,70 @@ Connection: close\r
                 await server.serve_forever()
                 
         except Exception as e:
-            print_log(f"CRITICAL: Web server failed to start: {e}", "ERROR")
-            print_log(f"Port {WEB_PORT} may be in use or blocked", "ERROR")
+            print_log(f"CRITICAL: Web server failed to start: {e}", level="ERROR")
+            print_log(f"Port {WEB_PORT} may be in use or blocked", level="ERROR")
             # Don't crash the entire application
             while self.running:
-                await asyncio.sleep(10)
+                await asyncio.sleep_ms(10000)
     
     async def plc_polling_task(self):
         """Background task for PLC data polling"""
         while self.running:
             try:
-                self.poll_plc_data()
-                gc.collect()  # Memory management
-                await asyncio.sleep(POLL_INTERVAL)
+                t0 = time.ticks_ms()
+                await self.poll_plc_data()
+                # The one GC policy for the bridge and its scripts: automatic collection is driven
+                # by gc.threshold, a collection is only forced when memory runs low
+                if gc.mem_free() < GC_LOW_WATERMARK:
+                    gc.collect()
+                self._stamp_status()
+                await sleep_until_next_poll(t0)
             except Exception as e:
-                print_log(f"Polling task error: {e}", "ERROR")
-                await asyncio.sleep(5)
+                print_log("Polling task error: %s", e, level="ERROR")
+                await asyncio.sleep_ms(5000)
     
-    async def status_led_task(self):
-        """Background task for status LED indication"""
+    async def network_scan_task(self):
+        """Background task that keeps the WiFi scan cache fresh for the config portal"""
         while self.running:
             try:
                 if self.operating_mode == MODE_AP:
-                    # Slow blink in AP mode
-                    blink_pattern(self.status_led, 1, 500, 1500)
-                elif self.operating_mode == MODE_STA and self.sta_if.isconnected():
-                    # Steady on when connected
-                    self.status_led.on()
-                    await asyncio.sleep(2)
-                else:
-                    # Fast blink when disconnected
-                    blink_pattern(self.status_led, 2, 100, 100)
-                    await asyncio.sleep(1)
+                    if not self.sta_if.active():
+                        self.sta_if.active(True)
+                        await asyncio.sleep_ms(1000)
+                    self.scan_networks(force=True)
+                await asyncio.sleep_ms(SCAN_REFRESH_INTERVAL)
             except Exception as e:
-                print_log(f"Status LED task error: {e}", "ERROR")
-                await asyncio.sleep(5)
+                print_log("Network scan task error: %s", e, level="ERROR")
+                await asyncio.sleep_ms(5000)
+    
+    def _led_link_up(self):
+        """WiFi link state for the LED, only asked of the driver every LED_LINK_CHECK_TICKS"""
+        age = self._link_age + 1
+        if age >= LED_LINK_CHECK_TICKS:
+            age = 0
+            self._link_up = self.sta_if.isconnected()
+        self._link_age = age
+        return self._link_up
+    
+    def _status_led_tick(self, timer):
+        """Timer callback stepping the status LED pattern for the current mode"""
+        if self.operating_mode == MODE_AP:
+            # Slow blink in AP mode
+            pattern = LED_AP_PATTERN
+            steps = LED_AP_STEPS
+        elif self._led_link_up():
+            # Steady on when connected
+            self.status_led.on()
+            return
+        else:
+            # Fast double blink when disconnected
+            pattern = LED_OFFLINE_PATTERN
+            steps = LED_OFFLINE_STEPS
+        step = self._led_step + 1
+        if step >= steps:
+            step = 0
+        self._led_step = step
+        self.status_led.value((pattern >> step) & 1)
     
     async def run(self):
         """Main application runner"""
@@ -940,11 +1073,18 @@ Connection: close\r
         
         self.running = True
         
+        # Status LED runs off a hardware timer instead of its own asyncio task
+        self._led_step = 0
+        self._link_up = self.sta_if.isconnected()
+        self._link_age = 0
+        led_timer = Timer(1)
+        led_timer.init(period=LED_TICK_MS, mode=Timer.PERIODIC, callback=self._status_led_tick)
+        
         # Start main application tasks
         tasks = [
             asyncio.create_task(self.start_web_server()),
             asyncio.create_task(self.plc_polling_task()),
-            asyncio.create_task(self.status_led_task())
+            asyncio.create_task(self.network_scan_task())
         ]
         
         try:
@@ -954,9 +1094,10 @@ Connection: close\r
             print_log("Received shutdown signal")
             self.running = False
         except Exception as e:
-            print_log(f"Main application error: {e}", "ERROR")
+            print_log(f"Main application error: {e}", level="ERROR")
             self.running = False
         
+        led_timer.deinit()
         print_log("ESP-32 PLC Bridge shutting down")
 
 # Main execution
@@ -0,0 +1,14 @@
+# MicroPython frozen-module manifest for the ESP-32 PLC Bridge
+# Build firmware with: make BOARD=ESP32_GENERIC FROZEN_MANIFEST=/path/to/ESP32_Files/manifest.py
+
+# Keep the board's default frozen modules
+include("$(PORT_DIR)/boards/manifest.py")
+
+# Built-in scripts and web page scaffolding run from flash instead of being loaded into RAM
+freeze(".", ("plc_scripts.py", "html_pages.py"), opt=3)
+
+# Application code, a frozen main.py is run at boot in place of one on the filesystem
+freeze(".", ("main.py", "custom_scripts.py"), opt=3)
+
+# Settings are baked into the image, edit config.py before building
+freeze(".", "config.py", opt=3)
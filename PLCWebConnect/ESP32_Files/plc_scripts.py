@@ -0,0 +1,51 @@
+"""
+ESP-32 built-in automation scripts
+Plain functions called by the script engine as fn(plc_data, gpio, write_coils).
+plc_data['inputs'], ['coils'] and ['registers'] are indexed from 0 (X000, Y000, DS001).
+Kept in their own module so they can be frozen into the firmware image.
+"""
+
+# Emergency stop clears outputs 1-8
+_ALL_OUTPUTS_OFF = [False] * 8
+
+# Status LED blink phase counter
+_blink_phase = 0
+
+# Temperature alarm edge state
+_temp_alarm_active = False
+
+def status_led(plc_data, gpio, write_coils):
+    """Status LED control, phase advances once per poll"""
+    global _blink_phase
+    _blink_phase = (_blink_phase + 1) & 3
+    if plc_data.get('connected', False):
+        # Slow blink when connected (toggle every second poll)
+        gpio.set_pin(2, _blink_phase & 2)
+    else:
+        # Fast blink when disconnected (toggle every poll)
+        gpio.set_pin(2, _blink_phase & 1)
+
+def emergency_stop(plc_data, gpio, write_coils):
+    """Emergency stop logic"""
+    emergency_input = plc_data['inputs'][0]
+    if not emergency_input:  # Emergency stop pressed (normally closed)
+        # Turn off all outputs in one Modbus transaction
+        write_coils(1, _ALL_OUTPUTS_OFF)
+        # Activate alarm output
+        gpio.set_pin(4, True)
+    else:
+        gpio.set_pin(4, False)
+
+def temp_alarm(plc_data, gpio, write_coils):
+    """Temperature alarm (assuming register 1 is temperature)"""
+    global _temp_alarm_active
+    temp_value = plc_data['registers'][0]
+    if temp_value > 750:  # 75.0 degrees (assuming 0.1 degree resolution)
+        gpio.set_pin(5, True)  # Activate alarm
+        if not _temp_alarm_active:
+            # Report once on the rising edge
+            _temp_alarm_active = True
+            print("Temperature alarm:", temp_value, "x0.1C")
+    elif temp_value < 700:  # Hysteresis
+        gpio.set_pin(5, False)
+        _temp_alarm_active = False
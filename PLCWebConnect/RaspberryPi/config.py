@@ -4,10 +4,31 @@ Handles all application configuration parameters
 """
 
 import os
+import struct
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Linux serial ioctls (asm-generic/ioctls.h) and the low-latency port flag
+TIOCGSERIAL = 0x541E
+TIOCSSERIAL = 0x541F
+ASYNC_LOW_LATENCY = 0x2000
+
+# Offset of the int flags field in struct serial_struct (type, line, port, irq, flags)
+SERIAL_FLAGS_OFFSET = 16
+
+# Serial device name prefixes under /dev, in order of preference
+SERIAL_PORT_PREFIXES = (
+    'ttyUSB',             # USB-Serial adapters (Linux)
+    'ttyACM',             # Arduino/USB CDC devices (Linux)
+    'ttyAMA',             # Raspberry Pi UART (Linux)
+    'cu.usbserial',       # macOS USB-Serial
+    'cu.SLAB_USBtoUART',  # macOS CP2102 adapters
+)
+
+# Ports found by the first scan of /dev, shared by every Config in the process
+_detected_ports = None
+
 class Config:
     """Configuration class with default values and environment variable support"""
     
@@ -15,12 +36,13 @@ class Config:
         # Web Server Configuration
         self.WEB_PORT = int(os.getenv('WEB_PORT', '5000'))
         self.DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+        self.WEB_THREADS = int(os.getenv('WEB_THREADS', '8'))  # waitress worker threads
         
         # PLC Communication Configuration
         self.CONNECTION_TYPE = os.getenv('CONNECTION_TYPE', 'serial')  # 'serial' or 'tcp'
         self.SERIAL_PORT = os.getenv('SERIAL_PORT', '/dev/ttyUSB0')  # Default USB-Serial port
+        self.SERIAL_PORT_FROM_ENV = 'SERIAL_PORT' in os.environ
         self.BAUD_RATE = int(os.getenv('BAUD_RATE', '9600'))
-        self.TIMEOUT = float(os.getenv('TIMEOUT', '3.0'))
         self.DEVICE_ADDRESS = int(os.getenv('DEVICE_ADDRESS', '1'))  # Modbus slave address
         
         # Modbus Configuration
@@ -29,20 +51,45 @@ class Config:
         self.STOPBITS = int(os.getenv('STOPBITS', '1'))
         self.BYTESIZE = int(os.getenv('BYTESIZE', '8'))
         
+        # Modbus RTU frame gap: 3.5 character times of 11 bits each
+        self.SILENT_INTERVAL = 3.5 * 11 / self.BAUD_RATE  # seconds
+        
         # Data Polling Configuration
         self.POLL_INTERVAL = float(os.getenv('POLL_INTERVAL', '1.0'))  # seconds
         
+        # Read one of coils / inputs / registers per poll in turn instead of all three. Each
+        # point type is then up to three polls old, and the reported data age is the oldest one's
+        self.POLL_ROUND_ROBIN = os.getenv('POLL_ROUND_ROBIN', 'False').lower() == 'true'
+        
+        # Optional combined holding-register window read with one request per poll:
+        # [X000-X015 bit word, Y000-Y015 bit word, DS001...]. The PLC program must pack
+        # the X/Y images into these registers. Leave PLC_BLOCK_START unset to read X, Y
+        # and DS with three separate requests.
+        block_start = os.getenv('PLC_BLOCK_START', '')
+        self.PLC_BLOCK_START = int(block_start) if block_start else None
+        self.PLC_BLOCK_LEN = int(os.getenv('PLC_BLOCK_LEN', '12'))
+        
+        # No-reply timeout, replies are read by expected length. The default covers sending an
+        # FC3 request and receiving the largest register reply at BAUD_RATE (11 bits a
+        # character) plus 50 ms of PLC turnaround, and is never below 100 ms
+        frame_bytes = 8 + 5 + 2 * self.PLC_BLOCK_LEN
+        default_timeout = max(0.1, frame_bytes * 11 / self.BAUD_RATE + 0.05)
+        self.TIMEOUT = float(os.getenv('TIMEOUT', str(default_timeout)))  # seconds
+        
         # Alternative serial ports for different platforms
         self.AUTO_DETECT_PORT = os.getenv('AUTO_DETECT_PORT', 'True').lower() == 'true'
         
+        # Ask the serial driver to skip its receive latency timer (FTDI adapters default to 16 ms)
+        self.SERIAL_LOW_LATENCY = os.getenv('SERIAL_LOW_LATENCY', 'True').lower() == 'true'
+        
         # Simulation mode for demo when no PLC is connected
         self.SIMULATION_MODE = os.getenv('SIMULATION_MODE', 'True').lower() == 'true'
         
         # Log configuration
         self._log_config()
         
-        # Auto-detect serial port if enabled
-        if self.AUTO_DETECT_PORT:
+        # Auto-detect serial port if enabled and not set explicitly
+        if self.AUTO_DETECT_PORT and not self.SERIAL_PORT_FROM_ENV:
             self._auto_detect_serial_port()
     
     def _log_config(self):
@@ -52,27 +99,36 @@ class Config:
         logger.info(f"Connection Type: {self.CONNECTION_TYPE}")
         logger.info(f"Serial Port: {self.SERIAL_PORT}")
         logger.info(f"Baud Rate: {self.BAUD_RATE}")
+        logger.info(f"Timeout: {self.TIMEOUT}s")
         logger.info(f"Modbus Method: {self.MODBUS_METHOD}")
         logger.info(f"Device Address: {self.DEVICE_ADDRESS}")
         logger.info(f"Poll Interval: {self.POLL_INTERVAL}s")
         logger.info("=====================================")
     
+    @staticmethod
+    def _scan_serial_ports():
+        """List serial ports in /dev with one directory scan, cached for the process"""
+        global _detected_ports
+        if _detected_ports is None:
+            try:
+                with os.scandir('/dev') as entries:
+                    ports = [(entry.name, entry.path) for entry in entries
+                             if entry.name.startswith(SERIAL_PORT_PREFIXES)]
+            except OSError:
+                ports = []
+            
+            def preference(port):
+                name = port[0]
+                for rank, prefix in enumerate(SERIAL_PORT_PREFIXES):
+                    if name.startswith(prefix):
+                        return rank, name
+            
+            _detected_ports = [path for _, path in sorted(ports, key=preference)]
+        return _detected_ports
+    
     def _auto_detect_serial_port(self):
         """Auto-detect available serial ports"""
-        import glob
-        
-        # Common serial port patterns for different platforms
-        port_patterns = [
-            '/dev/ttyUSB*',      # USB-Serial adapters (Linux)
-            '/dev/ttyACM*',      # Arduino/USB CDC devices (Linux)
-            '/dev/ttyAMA*',      # Raspberry Pi UART (Linux)
-            '/dev/cu.usbserial*', # macOS USB-Serial
-            '/dev/cu.SLAB_USBtoUART*', # macOS CP2102 adapters
-        ]
-        
-        available_ports = []
-        for pattern in port_patterns:
-            available_ports.extend(glob.glob(pattern))
+        available_ports = self._scan_serial_ports()
         
         if available_ports:
             logger.info(f"Available serial ports: {available_ports}")
@@ -85,6 +141,51 @@ class Config:
         else:
             logger.warning("No serial ports detected")
     
+    def enable_low_latency(self):
+        """Set ASYNC_LOW_LATENCY on the serial port, falling back to the usb-serial latency_timer
+        
+        Called when the PLC connection opens the port, so a Config built for simulation or
+        diagnostics never changes kernel state on the port.
+        """
+        if not self.SERIAL_LOW_LATENCY or not os.path.exists(self.SERIAL_PORT):
+            return
+        
+        try:
+            import fcntl
+            import termios
+        except ImportError:
+            return  # Not a Linux host
+        
+        get_serial = getattr(termios, 'TIOCGSERIAL', TIOCGSERIAL)
+        set_serial = getattr(termios, 'TIOCSSERIAL', TIOCSSERIAL)
+        
+        try:
+            fd = os.open(self.SERIAL_PORT, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+            try:
+                # Large enough for struct serial_struct on 32 and 64 bit kernels
+                buf = bytearray(128)
+                fcntl.ioctl(fd, get_serial, buf)
+                flags = struct.unpack_from('i', buf, SERIAL_FLAGS_OFFSET)[0]
+                if not flags & ASYNC_LOW_LATENCY:
+                    struct.pack_into('i', buf, SERIAL_FLAGS_OFFSET, flags | ASYNC_LOW_LATENCY)
+                    fcntl.ioctl(fd, set_serial, buf)
+                logger.info(f"Low latency mode enabled on {self.SERIAL_PORT}")
+                return
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"TIOCSSERIAL low latency not available on {self.SERIAL_PORT}: {e}")
+        
+        # USB-serial drivers also expose the timer directly in sysfs
+        tty_name = os.path.basename(os.path.realpath(self.SERIAL_PORT))
+        latency_path = f"/sys/bus/usb-serial/devices/{tty_name}/latency_timer"
+        try:
+            with open(latency_path, 'w') as f:
+                f.write('1')
+            logger.info(f"Latency timer set to 1 ms on {self.SERIAL_PORT}")
+        except OSError as e:
+            logger.warning(f"Could not enable low latency on {self.SERIAL_PORT}: {e}")
+    
     def get_connection_info(self):
         """Get connection information as dictionary"""
         return {
@@ -5,13 +5,159 @@ Allows user-programmable GPIO control and Modbus bit manipulation
 
 import time
 import logging
-from typing import Dict, Any, List, Callable
+from dataclasses import dataclass
+from typing import Dict, Any, List, Callable, Tuple
 import json
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Builtins exposed to user scripts
+SCRIPT_BUILTINS = {
+    "len": len,
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "max": max,
+    "min": min,
+    "abs": abs,
+    "round": round,
+}
+
+class PLCDataView:
+    """Flat per-poll view of plc_data for scripts
+    
+    Points are plain attributes (plc_data.X001, plc_data.Y005, plc_data.DS001),
+    so a script reads a signal with one attribute load. Top-level keys are still
+    available as plc_data['connected'] or plc_data.get('input_status', {}).
+    """
+    
+    # Sections whose points are flattened into attributes
+    POINT_SECTIONS = ('input_status', 'coil_status', 'data_registers')
+    
+    def __init__(self, plc_data: Dict):
+        self._data = plc_data
+        for section in self.POINT_SECTIONS:
+            points = plc_data.get(section)
+            if points:
+                self.__dict__.update(points)
+    
+    def __getattr__(self, name: str):
+        # Only reached for points the PLC has not reported yet
+        if name.startswith('DS'):
+            return 0
+        if name[:1] in ('X', 'Y'):
+            return False
+        raise AttributeError(name)
+    
+    def __getitem__(self, key: str):
+        return self._data[key]
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+    
+    def get(self, key: str, default=None):
+        return self._data.get(key, default)
+
+@dataclass(frozen=True)
+class ScriptIR:
+    """Compiled form of a script built from one fixed operation
+    
+    Scripts whose logic fits one of these operations carry an "ir" dict next
+    to their code, e.g. {"op": "AND_INPUTS_TO_COIL", "src": ["X002", "X003"],
+    "dst": 5}. They are run by a small interpreter instead of exec'd Python.
+    """
+    op: str
+    src: Tuple[str, ...] = ()
+    dst: int = 0
+    threshold: int = 0
+    period: float = 0.0
+    
+    @classmethod
+    def from_dict(cls, ir: Dict) -> "ScriptIR":
+        """Validate a script's "ir" dict and convert it to a ScriptIR"""
+        op = ir.get("op")
+        if op not in IR_OPS:
+            raise ValueError(f"Unknown script op: {op}")
+        
+        src = ir.get("src", ())
+        if not isinstance(src, (list, tuple)) or not all(isinstance(point, str) for point in src):
+            raise ValueError(f"{op}: src must be a list of point names")
+        if op in ("SET_PIN_FROM_INPUT", "REGISTER_THRESHOLD") and len(src) != 1:
+            raise ValueError(f"{op}: src must name exactly one point")
+        if op == "AND_INPUTS_TO_COIL" and not src:
+            raise ValueError(f"{op}: src must name at least one point")
+        if op == "REGISTER_THRESHOLD" and not src[0].startswith("DS"):
+            raise ValueError(f"{op}: src must be a DS register")
+        
+        script_ir = cls(
+            op=op,
+            src=tuple(src),
+            dst=int(ir.get("dst", 0)),
+            threshold=int(ir.get("threshold", 0)),
+            period=float(ir.get("period", 0.0)),
+        )
+        if script_ir.dst < 0:
+            raise ValueError(f"{op}: dst must not be negative")
+        if op == "REGISTER_THRESHOLD" and not 0 <= script_ir.threshold <= 0xFFFF:
+            raise ValueError(f"{op}: threshold must be a 16-bit register value")
+        if op == "TIMER_TOGGLE" and not script_ir.period > 0:
+            raise ValueError(f"{op}: period must be greater than 0")
+        return script_ir
+
+def _ir_set_pin_from_input(ir: ScriptIR, plc_data, gpio, script_state: Dict) -> Dict:
+    """GPIO pin dst follows PLC point src[0]"""
+    point = ir.src[0]
+    if getattr(plc_data, point):
+        gpio.set_pin(ir.dst, True)
+        return {"status": f"GPIO {ir.dst} ON - {point} active"}
+    gpio.set_pin(ir.dst, False)
+    return {"status": f"GPIO {ir.dst} OFF - {point} inactive"}
+
+def _ir_and_inputs_to_coil(ir: ScriptIR, plc_data, gpio, script_state: Dict) -> Dict:
+    """PLC coil Y<dst> = AND of the src points"""
+    values = [getattr(plc_data, point) for point in ir.src]
+    value = all(values)
+    inputs = ", ".join(f"{point}={v}" for point, v in zip(ir.src, values))
+    if gpio.write_coil(ir.dst, value):
+        return {"status": f"Y{ir.dst:03d} = {value} ({inputs})"}
+    return {"status": f"Failed to write Y{ir.dst:03d}", "error": True}
+
+def _ir_timer_toggle(ir: ScriptIR, plc_data, gpio, script_state: Dict) -> Dict:
+    """GPIO pin dst toggles every period seconds"""
+    current_time = time.time()
+    if 'last_toggle' not in script_state:
+        script_state['last_toggle'] = current_time
+        script_state['pin_state'] = False
+    
+    elapsed = current_time - script_state['last_toggle']
+    if elapsed >= ir.period:
+        script_state['pin_state'] = not script_state['pin_state']
+        gpio.set_pin(ir.dst, script_state['pin_state'])
+        script_state['last_toggle'] = current_time
+        return {"status": f"GPIO {ir.dst} toggled to {script_state['pin_state']}"}
+    return {"status": f"Next toggle in {ir.period - elapsed:.1f}s"}
+
+def _ir_register_threshold(ir: ScriptIR, plc_data, gpio, script_state: Dict) -> Dict:
+    """GPIO pin dst is on while register src[0] is above threshold"""
+    register = ir.src[0]
+    value = getattr(plc_data, register)
+    if value > ir.threshold:
+        gpio.set_pin(ir.dst, True)
+        return {"status": f"Alert! {register} = {value} (GPIO {ir.dst} ON)"}
+    gpio.set_pin(ir.dst, False)
+    return {"status": f"{register} = {value} (Normal)"}
+
+# Script IR op code -> interpreter function
+IR_OPS = {
+    "SET_PIN_FROM_INPUT": _ir_set_pin_from_input,
+    "AND_INPUTS_TO_COIL": _ir_and_inputs_to_coil,
+    "TIMER_TOGGLE": _ir_timer_toggle,
+    "REGISTER_THRESHOLD": _ir_register_threshold,
+}
+
 class ScriptEngine:
     """Engine for executing user-defined automation scripts"""
     
@@ -44,13 +190,14 @@ class ScriptEngine:
             "description": "Controls GPIO pin 18 based on PLC input X001",
             "enabled": False,
             "gpio_pins": [18],
+            "ir": {"op": "SET_PIN_FROM_INPUT", "src": ["X001"], "dst": 18},
             "code": """
 # GPIO Output Control Example
 # Monitors PLC input X001 and controls GPIO pin 18
 
 def execute(plc_data, gpio, script_state):
     # Get PLC input status
-    x001_status = plc_data.get('input_status', {}).get('X001', False)
+    x001_status = plc_data.X001
     
     # Control GPIO pin 18 based on X001
     if x001_status:
@@ -68,14 +215,15 @@ def execute(plc_data, gpio, script_state):
             "description": "Sets PLC coil Y005 when X002 and X003 are both active",
             "enabled": False,
             "gpio_pins": [],
+            "ir": {"op": "AND_INPUTS_TO_COIL", "src": ["X002", "X003"], "dst": 5},
             "code": """
 # Modbus Bit Control Example
 # Logic: Y005 = X002 AND X003
 
 def execute(plc_data, gpio, script_state):
     # Get input statuses
-    x002 = plc_data.get('input_status', {}).get('X002', False)
-    x003 = plc_data.get('input_status', {}).get('X003', False)
+    x002 = plc_data.X002
+    x003 = plc_data.X003
     
     # Calculate output
     y005_value = x002 and x003
@@ -94,6 +242,7 @@ def execute(plc_data, gpio, script_state):
             "description": "Toggles GPIO pin 19 every 5 seconds",
             "enabled": False,
             "gpio_pins": [19],
+            "ir": {"op": "TIMER_TOGGLE", "dst": 19, "period": 5.0},
             "code": """
 # Timer Control Example
 # Toggles GPIO pin 19 every 5 seconds
@@ -126,13 +275,14 @@ def execute(plc_data, gpio, script_state):
             "description": "Monitors DS001 and triggers GPIO when value exceeds 100",
             "enabled": False,
             "gpio_pins": [20],
+            "ir": {"op": "REGISTER_THRESHOLD", "src": ["DS001"], "dst": 20, "threshold": 100},
             "code": """
 # Data Register Monitor Example
 # Triggers GPIO 20 when DS001 > 100
 
 def execute(plc_data, gpio, script_state):
     # Get data register value
-    ds001_value = plc_data.get('data_registers', {}).get('DS001', 0)
+    ds001_value = plc_data.DS001
     
     # Check threshold
     if ds001_value > 100:
@@ -195,12 +345,22 @@ class GPIOController:
         return True
     
     def get_pin_states(self) -> Dict[int, Dict]:
-        """Get all pin states"""
+        """Get all pin states, copied so readers on other threads never iterate the live dict"""
         return self.pin_states.copy()
 
+# _prepared_pins default for scripts never set up; a script without "gpio_pins" stores None
+_UNPREPARED = object()
+
 class ScriptExecutor:
     """Executes user scripts safely"""
     
+    # Globals every script module starts from, built once at import
+    _EXEC_GLOBALS = {
+        "time": time,
+        "logger": logger,
+        "__builtins__": SCRIPT_BUILTINS
+    }
+    
     def __init__(self, script_engine):
         self.engine = script_engine
         self.gpio = GPIOController(script_engine.gpio_available)
@@ -208,6 +368,50 @@ class ScriptExecutor:
         # Enhanced GPIO controller with PLC write capability
         self.gpio.write_coil = self._write_coil_wrapper
         self.gpio.write_register = self._write_register_wrapper
+        
+        # script_id -> (source, execute function), rebuilt when a script's code changes
+        self._compiled_scripts = {}
+        
+        # script_id -> ("ir" dict, ScriptIR), rebuilt when a script's ir is replaced
+        self._script_irs = {}
+        
+        # script_id -> gpio_pins list its pins were set up for
+        self._prepared_pins = {}
+    
+    def _prepare_script(self, script_id: str, script: Dict):
+        """Set up a script's GPIO pins and state once, before its first run"""
+        pins = script.get("gpio_pins")
+        for pin in pins or ():
+            if pin not in self.gpio.pin_states:
+                self.gpio.setup_pin(pin, "output")
+        
+        self.engine.script_states.setdefault(script_id, {})
+        
+        self._prepared_pins[script_id] = pins
+    
+    def _get_execute_function(self, script_id: str, script: Dict) -> Callable:
+        """Compile a script once and return its execute function (None if undefined)"""
+        code = script["code"]
+        cached = self._compiled_scripts.get(script_id)
+        if cached is not None and cached[0] is code:
+            return cached[1]
+        
+        # Shallow copy so names one script defines cannot clobber another's
+        exec_globals = self._EXEC_GLOBALS.copy()
+        exec(compile(code, script_id, "exec"), exec_globals)
+        execute = exec_globals.get("execute")
+        self._compiled_scripts[script_id] = (code, execute)
+        return execute
+    
+    def _get_script_ir(self, script_id: str, ir: Dict) -> ScriptIR:
+        """Convert a script's "ir" dict once and return the cached ScriptIR"""
+        cached = self._script_irs.get(script_id)
+        if cached is not None and cached[0] is ir:
+            return cached[1]
+        
+        script_ir = ScriptIR.from_dict(ir)
+        self._script_irs[script_id] = (ir, script_ir)
+        return script_ir
     
     def _write_coil_wrapper(self, address: int, value: bool) -> bool:
         """Wrapper for PLC coil writing"""
@@ -227,6 +431,9 @@ class ScriptExecutor:
     
     def execute_script(self, script_id: str, plc_data: Dict) -> Dict[str, Any]:
         """Execute a single script"""
+        if not isinstance(plc_data, PLCDataView):
+            plc_data = PLCDataView(plc_data)
+        
         if script_id not in self.engine.scripts:
             return {"error": f"Script {script_id} not found"}
         
@@ -236,50 +443,31 @@ class ScriptExecutor:
             return {"status": "Script disabled"}
         
         try:
-            # Setup GPIO pins if needed
-            for pin in script.get("gpio_pins", []):
-                if pin not in self.gpio.pin_states:
-                    self.gpio.setup_pin(pin, "output")
-            
-            # Get or create script state
-            if script_id not in self.engine.script_states:
-                self.engine.script_states[script_id] = {}
+            # Pins are only set up again if the script's pin list was replaced
+            if self._prepared_pins.get(script_id, _UNPREPARED) is not script.get("gpio_pins"):
+                self._prepare_script(script_id, script)
             
-            script_state = self.engine.script_states[script_id]
+            script_state = self.engine.script_states.setdefault(script_id, {})
             
-            # Create execution environment
-            exec_globals = {
-                "time": time,
-                "logger": logger,
-                "__builtins__": {
-                    "len": len,
-                    "str": str,
-                    "int": int,
-                    "float": float,
-                    "bool": bool,
-                    "max": max,
-                    "min": min,
-                    "abs": abs,
-                    "round": round,
-                }
-            }
+            ir = script.get("ir")
+            if ir is not None:
+                # Fixed-operation scripts run through the IR interpreter, no exec
+                script_ir = self._get_script_ir(script_id, ir)
+                result = IR_OPS[script_ir.op](script_ir, plc_data, self.gpio, script_state)
+            else:
+                # Compiled once per code revision, not on every poll
+                execute = self._get_execute_function(script_id, script)
+                if execute is None:
+                    return {"error": "Script must define an 'execute' function"}
+                result = execute(plc_data, self.gpio, script_state)
             
-            # Execute the script code
-            exec(script["code"], exec_globals)
+            # Add script info to result
+            if isinstance(result, dict):
+                result["script_name"] = script["name"]
+                result["script_id"] = script_id
+                result["timestamp"] = time.time()
             
-            # Call the execute function
-            if "execute" in exec_globals:
-                result = exec_globals["execute"](plc_data, self.gpio, script_state)
-                
-                # Add script info to result
-                if isinstance(result, dict):
-                    result["script_name"] = script["name"]
-                    result["script_id"] = script_id
-                    result["timestamp"] = time.time()
-                
-                return result
-            else:
-                return {"error": "Script must define an 'execute' function"}
+            return result
                 
         except Exception as e:
             logger.error(f"Script execution error in {script_id}: {e}")
@@ -293,11 +481,13 @@ class ScriptExecutor:
         """Execute all enabled scripts"""
         results = {}
         
+        # One flat view per poll, shared by every script
+        view = PLCDataView(plc_data)
         for script_id, script in self.engine.scripts.items():
             if script.get("enabled", False):
-                results[script_id] = self.execute_script(script_id, plc_data)
+                results[script_id] = self.execute_script(script_id, view)
         
-        # Add GPIO states to results
+        # Add GPIO states to results, snapshotted here on the worker that changes them
         results["gpio_states"] = self.gpio.get_pin_states()
         
         return results
@@ -10,6 +10,9 @@ import subprocess
 import serial
 import time
 import socket
+import glob
+import stat
+import grp
 from pathlib import Path
 
 def run_command(cmd):
@@ -48,15 +51,20 @@ def check_system_dependencies():
     print("\n=== System Dependencies ===")
     
     # GPIO libraries
-    success, _, _ = run_command("python3 -c 'import RPi.GPIO'")
-    if success:
+    try:
+        import RPi.GPIO
         print("✓ RPi.GPIO available")
-    else:
+    except (ImportError, RuntimeError):
         print("✗ RPi.GPIO not available (install with: pip install RPi.GPIO)")
     
     # User groups
-    success, output, _ = run_command("groups")
-    if "dialout" in output:
+    groups = set()
+    for gid in os.getgroups():
+        try:
+            groups.add(grp.getgrgid(gid).gr_name)
+        except KeyError:
+            pass
+    if "dialout" in groups:
         print("✓ User in dialout group")
     else:
         print("✗ User not in dialout group - run: sudo usermod -a -G dialout $USER")
@@ -66,13 +74,17 @@ def check_serial_ports():
     print("\n=== Serial Ports ===")
     
     # List available ports
-    success, output, _ = run_command("ls -la /dev/tty*")
-    usb_ports = [line for line in output.split('\n') if 'ttyUSB' in line or 'ttyAMA' in line]
+    usb_ports = sorted(glob.glob("/dev/ttyUSB*") + glob.glob("/dev/ttyAMA*"))
     
     if usb_ports:
         print("Available serial ports:")
         for port in usb_ports:
-            print(f"  {port}")
+            try:
+                st = os.stat(port)
+                group = grp.getgrgid(st.st_gid).gr_name
+                print(f"  {stat.filemode(st.st_mode)} {group:<8} {port}")
+            except (OSError, KeyError):
+                print(f"  {port}")
     else:
         print("No USB serial ports found")
     
@@ -85,24 +97,78 @@ def check_serial_ports():
     except Exception as e:
         print(f"✗ Cannot access {port}: {e}")
 
+def port_is_listening(port):
+    """Check for a listening TCP socket from the kernel tables, without connecting"""
+    local_port = f":{port:04X}"
+    tables_read = False
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                lines = f.read().splitlines()[1:]
+        except OSError:
+            continue
+        tables_read = True
+        for line in lines:
+            fields = line.split()
+            # local_address is ADDR:PORT in hex, state 0A is LISTEN
+            if len(fields) > 3 and fields[1].endswith(local_port) and fields[3] == "0A":
+                return True
+    
+    if tables_read:
+        return False
+    
+    # No procfs (not Linux), fall back to a loopback connect
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        return sock.connect_ex(('localhost', port)) == 0
+    finally:
+        sock.close()
+
+def interface_addresses():
+    """IPv4 addresses of the network interfaces, loopback excluded (like hostname -I)"""
+    ips = []
+    try:
+        with open("/proc/net/fib_trie") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        lines = None
+    
+    if lines is not None:
+        # Each local address is a "|-- ADDR" leaf followed by a "/32 host LOCAL" line
+        for prev, line in zip(lines, lines[1:]):
+            if line.strip() == "/32 host LOCAL":
+                ip = prev.split()[-1]
+                if not ip.startswith("127.") and ip not in ips:
+                    ips.append(ip)
+        return ips
+    
+    # No procfs (not Linux), ask which address a routed UDP socket would use (nothing is sent)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.connect(("192.0.2.1", 9))
+        ip = sock.getsockname()[0]
+        if not ip.startswith("127.") and ip != "0.0.0.0":
+            ips.append(ip)
+    except OSError:
+        pass
+    finally:
+        sock.close()
+    return ips
+
 def check_network():
     """Check network connectivity"""
     print("\n=== Network ===")
     
     # Get IP addresses
-    success, output, _ = run_command("hostname -I")
-    if success and output:
-        ips = output.split()
+    ips = interface_addresses()
+    if ips:
         print(f"IP addresses: {', '.join(ips)}")
     else:
         print("No network connection")
     
     # Check if port 5000 is available
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex(('localhost', 5000))
-        sock.close()
-        if result == 0:
+        if port_is_listening(5000):
             print("⚠ Port 5000 is in use")
         else:
             print("✓ Port 5000 available")
@@ -113,18 +179,14 @@ def check_service_status():
     """Check systemd service status"""
     print("\n=== Service Status ===")
     
-    # Check if service exists
-    success, output, _ = run_command("systemctl list-unit-files | grep plc-bridge")
-    if success and output:
+    # One systemctl call for install, run and enable state
+    success, output, _ = run_command(
+        "systemctl show plc-bridge --property=LoadState,ActiveState,UnitFileState")
+    props = dict(line.split("=", 1) for line in output.splitlines() if "=" in line)
+    if success and props.get("LoadState") == "loaded":
         print("✓ plc-bridge service installed")
-        
-        # Check service status
-        success, output, _ = run_command("systemctl is-active plc-bridge")
-        print(f"Service status: {output}")
-        
-        # Check if enabled
-        success, output, _ = run_command("systemctl is-enabled plc-bridge")
-        print(f"Auto-start: {output}")
+        print(f"Service status: {props.get('ActiveState', 'unknown')}")
+        print(f"Auto-start: {props.get('UnitFileState', 'unknown')}")
     else:
         print("✗ plc-bridge service not installed")
 
@@ -7,9 +7,13 @@ Complete system for connecting AutomationDirect CLICK PLCs to web interfaces
 import sys
 import os
 import signal
+import asyncio
 import threading
-import time
 import logging
+import logging.handlers
+import queue
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add current directory to Python path
@@ -20,15 +24,25 @@ from plc_communication import PLCCommunicator
 from web_server import WebServer
 from custom_scripts import create_script_engine, ScriptExecutor
 
-# Configure logging
+# Configure logging. Records are only queued by the thread that logs them, the file and console
+# writes happen on the listener's own thread so polling never waits on disk I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('plc_web_bridge.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# Only merge the message arguments when queueing, the listener's handlers add the layout
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('plc_web_bridge.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[_queue_handler],
+    force=True  # replace the default handler added by warnings logged while importing
 )
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +61,12 @@ class PLCWebBridge:
         self.script_engine = create_script_engine(self.plc_communicator, self.config)
         self.script_executor = ScriptExecutor(self.script_engine)
         
+        # Scripts run on their own worker so a slow script never delays a poll. One worker
+        # keeps runs in order; while it is busy only the newest poll's data waits for it
+        self._script_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scripts')
+        self._script_future = None
+        self._pending_plc_data = None
+        
         # Initialize web server
         self.web_server = WebServer(
             self.plc_communicator, 
@@ -65,22 +85,16 @@ class PLCWebBridge:
         """Start the PLC web bridge application"""
         try:
             logger.info("Starting PLC Web Bridge Application")
+            self.running = True
             
-            # Connect to PLC
-            if self.plc_communicator.connect():
-                logger.info("PLC connection established successfully")
-            else:
-                logger.warning("PLC connection failed - running in simulation mode")
-            
-            # Start data polling thread
+            # Start data polling thread, it connects to the PLC on its own event loop
             logger.info("Starting PLC data polling loop")
-            polling_thread = threading.Thread(target=self._data_polling_loop, daemon=True)
+            polling_thread = threading.Thread(target=self._data_polling_thread, daemon=True)
             polling_thread.start()
             self.threads.append(polling_thread)
             
             # Start web server
             logger.info(f"Starting web server on port {self.config.WEB_PORT}")
-            self.running = True
             self.web_server.run()
             
         except Exception as e:
@@ -95,6 +109,8 @@ class PLCWebBridge:
         if self.plc_communicator:
             self.plc_communicator.disconnect()
         
+        self._script_pool.shutdown(wait=False, cancel_futures=True)
+        
         # Wait for threads to finish
         for thread in self.threads:
             if thread.is_alive():
@@ -102,29 +118,76 @@ class PLCWebBridge:
         
         logger.info("Application stopped successfully")
     
-    def _data_polling_loop(self):
-        """Background thread for continuous PLC data polling and script execution"""
+    def _data_polling_thread(self):
+        """Polling thread entry point, runs the asyncio polling loop"""
+        asyncio.run(self._data_polling_loop())
+    
+    async def _data_polling_loop(self):
+        """Continuous PLC data polling, each poll's scripts are handed off to the script worker"""
+        # Connect to PLC
+        if await self.plc_communicator.connect():
+            logger.info("PLC connection established successfully")
+        else:
+            logger.warning("PLC connection failed - running in simulation mode")
+        
         logger.info("PLC data polling loop started")
+        loop = asyncio.get_running_loop()
         
+        next_poll = loop.time()
         while self.running:
-            try:
-                # Poll PLC data
-                success = self.plc_communicator.poll_data()
-                
-                if success:
-                    # Execute custom scripts
-                    plc_data = self.plc_communicator.get_status()
-                    script_results = self.script_executor.execute_all_enabled_scripts(plc_data)
-                    
-                    # Store script results in PLC communicator for web access
-                    self.plc_communicator.script_results = script_results
-                    
-                # Sleep for the configured poll interval
-                time.sleep(self.config.POLL_INTERVAL)
-                
-            except Exception as e:
-                logger.error(f"Error in polling loop: {e}")
-                time.sleep(5)  # Wait before retrying
+            if await self._poll_at(next_poll):
+                self._submit_scripts(self.plc_communicator.get_status())
+            
+            # Polls are paced against a monotonic deadline, so the cycle time is POLL_INTERVAL
+            # however long the poll took
+            next_poll += self.config.POLL_INTERVAL
+            now = loop.time()
+            if next_poll < now:
+                # Overran the interval: poll again straight away and re-anchor the schedule
+                logger.debug(f"Poll cycle overran POLL_INTERVAL by {now - next_poll:.3f}s")
+                next_poll = now
+    
+    async def _poll_at(self, when):
+        """Wait until loop time `when`, then poll the PLC once"""
+        loop = asyncio.get_running_loop()
+        delay = when - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        try:
+            return await self.plc_communicator.poll_data()
+        except Exception as e:
+            logger.error(f"Error in polling loop: {e}")
+            await asyncio.sleep(5)  # Wait before retrying
+            return False
+    
+    def _submit_scripts(self, plc_data):
+        """Hand a poll's data to the script worker without waiting for the scripts to finish"""
+        if self._script_future is not None and not self._script_future.done():
+            # Still running an older poll: keep only the newest data, older data is dropped
+            self._pending_plc_data = plc_data
+            return
+        
+        loop = asyncio.get_running_loop()
+        self._script_future = loop.run_in_executor(
+            self._script_pool, self.script_executor.execute_all_enabled_scripts, plc_data)
+        self._script_future.add_done_callback(self._scripts_done)
+    
+    def _scripts_done(self, future):
+        """Store a finished run's results and start the next run if a poll is waiting"""
+        if future.cancelled():
+            return
+        
+        try:
+            # Store script results in PLC communicator for web access
+            self.plc_communicator.script_results = future.result()
+        except Exception as e:
+            logger.error(f"Error executing scripts: {e}")
+        
+        plc_data = self._pending_plc_data
+        if plc_data is not None and self.running:
+            self._pending_plc_data = None
+            self._submit_scripts(plc_data)
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
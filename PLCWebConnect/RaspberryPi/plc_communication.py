@@ -4,23 +4,97 @@ Supports Modbus RTU/ASCII communication via Serial/USB
 """
 
 import time
+import json
+import asyncio
 import logging
-import threading
+from functools import partial
+from operator import itemgetter
 from datetime import datetime
 import os
+import sys
 import random
 import math
+from array import array
+from dataclasses import dataclass
+from typing import Optional
 
 try:
-    from pymodbus.client import ModbusSerialClient
+    from pymodbus.client import AsyncModbusSerialClient
     from pymodbus.exceptions import ModbusException, ConnectionException
     MODBUS_AVAILABLE = True
 except ImportError:
     MODBUS_AVAILABLE = False
     logging.warning("pymodbus not available. Install with: pip install pymodbus pyserial")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+def _dumps(obj):
+    """Encode status JSON, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+# Points read from the PLC on every poll
+INPUT_COUNT = 16     # X000 onward (discrete inputs)
+COIL_COUNT = 16      # Y000 onward (coils)
+REGISTER_COUNT = 10  # DS001 onward (holding registers)
+
+# How long a computed data age is reused by get_status
+AGE_CACHE_SECONDS = 0.1
+
+# Point names, formatted and interned once at import. Interned keys compare by identity
+# with the attribute names in compiled scripts (plc_data.X001) and keep their cached hash
+_INPUT_KEYS = tuple(sys.intern(f'X{i:03d}') for i in range(INPUT_COUNT))
+_COIL_KEYS = tuple(sys.intern(f'Y{i:03d}') for i in range(COIL_COUNT))
+_REGISTER_KEYS = tuple(sys.intern(f'DS{i+1:03d}') for i in range(REGISTER_COUNT))
+
+# Simulation patterns, precomputed so each simulated poll is a few comprehensions
+_SIM_TOGGLE_DIVISORS = (2, 3, 4, 5)
+_SIM_COIL_DIVISORS = (2, 3, 4, 5)
+_SIM_INPUT_THRESHOLDS = (0.7,) * 4 + (0.9,) * (INPUT_COUNT - 8)
+_SIM_RANDOM_COILS = range(COIL_COUNT - 8)
+_SIM_RANDOM_REGISTERS = range(REGISTER_COUNT - 4)
+
+# SWAR constants: multiplying 7 bits by _SPREAD_MUL moves bit i to bit 8*i without carries
+_SPREAD_MUL = 0x2040810204081
+_BYTE_LSB_MASK = 0x0101010101010101
+
+def _spread_bits(word):
+    """Unpack a 16-bit register into 16 bytes of 0/1, LSB first, without a per-bit loop"""
+    lo = word & 0xFF
+    hi = (word >> 8) & 0xFF
+    lo = ((lo & 0x7F) * _SPREAD_MUL | (lo & 0x80) << 49) & _BYTE_LSB_MASK
+    hi = ((hi & 0x7F) * _SPREAD_MUL | (hi & 0x80) << 49) & _BYTE_LSB_MASK
+    return (lo | hi << 64).to_bytes(16, 'little')
+
+@dataclass(frozen=True)
+class PlcSnapshot:
+    """One published poll: the point data, its encoded JSON members and when it was taken"""
+    __slots__ = ('updated_mono', 'fresh_seconds', 'data', 'data_json')
+    updated_mono: Optional[float]  # time.monotonic() of the oldest data read, None before the first poll
+    fresh_seconds: float           # data older than this is reported as stale
+    data: dict                     # last_update, point dicts and batch_offset
+    data_json: str                 # data encoded as JSON object members, without the braces
+    
+    @property
+    def data_age_seconds(self):
+        """Seconds since the poll, None before the first one"""
+        if self.updated_mono is None:
+            return None
+        return time.monotonic() - self.updated_mono
+    
+    @property
+    def data_fresh(self):
+        """Whether the poll is recent enough to be shown as live data"""
+        age = self.data_age_seconds
+        return age is not None and age < self.fresh_seconds
+
 class PLCCommunicator:
     """Handles communication with AutomationDirect CLICK PLC"""
     
@@ -30,18 +104,48 @@ class PLCCommunicator:
         self.connected = False
         self.last_data = {}
         self.last_update = None
-        self.connection_lock = threading.Lock()
+        self.last_update_mono = None  # time.monotonic() matching last_update
+        # Latest published PlcSnapshot. Each poll builds a new one and swaps the reference,
+        # so readers on other threads take it without a lock and never see it change
+        self._snapshot = None
+        # (snapshot, valid until, data_age_seconds, data_fresh), times are monotonic
+        self._age_cache = (None, 0.0, None, False)
+        # Created on the polling event loop by connect(); every Modbus operation is queued
+        # and run in order by one worker task, so only one transaction is ever on the bus
+        self._io_queue = None
+        self._io_task = None
+        self._loop = None
+        self.last_frame_time = 0.0
         self.simulation_mode = config.SIMULATION_MODE
         self.simulation_counter = 0
+        # Simulated temperature sine wave, advanced one poll per call by rotating (sin, cos)
+        # through a fixed POLL_INTERVAL / 10 step instead of calling math.sin every poll
+        phase = time.time() / 10
+        step = config.POLL_INTERVAL / 10
+        self._sim_sin = math.sin(phase)
+        self._sim_cos = math.cos(phase)
+        self._sim_step_sin = math.sin(step)
+        self._sim_step_cos = math.cos(step)
         
-        # PLC status data structure
+        # Latest point values, one flat array per type; *_count is how many have been read
+        self._inputs = bytearray(INPUT_COUNT)
+        self._coils = bytearray(COIL_COUNT)
+        self._registers = array('H', bytes(2 * REGISTER_COUNT))
+        self._input_count = 0
+        self._coil_count = 0
+        self._register_count = 0
+        
+        # Read requests (point type, start address, count); with POLL_ROUND_ROBIN one is sent per poll
+        self._batches = (('coils', 0, COIL_COUNT), ('inputs', 0, INPUT_COUNT), ('registers', 0, REGISTER_COUNT))
+        self._batch_idx = 0
+        self.batch_offset = None
+        # (time.time(), time.monotonic()) of each batch's last successful read
+        self._batch_times = [None] * len(self._batches)
+        
+        # PLC status data structure (point dicts come from the published poll snapshot)
         self.plc_status = {
             'connected': False,
-            'last_update': None,
             'communication_errors': 0,
-            'data_registers': {},
-            'coil_status': {},
-            'input_status': {},
             'system_info': {
                 'plc_model': 'AutomationDirect CLICK' + (' (Simulation)' if self.simulation_mode else ''),
                 'communication_type': config.MODBUS_METHOD,
@@ -49,9 +153,15 @@ class PLCCommunicator:
                 'device_address': config.DEVICE_ADDRESS
             }
         }
+        # Readers get empty point dicts until the first poll
+        self._publish()
     
-    def connect(self):
-        """Establish connection to the PLC"""
+    async def connect(self):
+        """Establish connection to the PLC, the calling event loop then owns the Modbus client"""
+        self._loop = asyncio.get_running_loop()
+        self._io_queue = asyncio.Queue()
+        self._io_task = self._loop.create_task(self._io_worker())
+        
         # Check if simulation mode is enabled
         if self.simulation_mode:
             logger.info("Starting PLC simulation mode")
@@ -64,44 +174,51 @@ class PLCCommunicator:
             return False
             
         try:
-            with self.connection_lock:
-                # Create Modbus client based on configuration
-                if self.config.CONNECTION_TYPE.lower() == 'serial':
-                    if MODBUS_AVAILABLE:
-                        self.client = ModbusSerialClient(
-                            port=self.config.SERIAL_PORT,
-                            baudrate=self.config.BAUD_RATE,
-                            timeout=self.config.TIMEOUT,
-                            parity=self.config.PARITY,
-                            stopbits=self.config.STOPBITS,
-                            bytesize=self.config.BYTESIZE
-                        )
-                    else:
-                        return False
+            # Create Modbus client based on configuration
+            if self.config.CONNECTION_TYPE.lower() == 'serial':
+                if MODBUS_AVAILABLE:
+                    self.config.enable_low_latency()
+                    
+                    # The asyncio transport hands over whatever bytes the port delivered and
+                    # the RTU framer decodes once the expected length is in, so there is no
+                    # per-byte read or inter-character sleep to tune (unlike the sync client).
+                    # Fewer transactions per poll (round-robin or PLC_BLOCK_START) is what
+                    # cuts the fixed cost per read
+                    self.client = AsyncModbusSerialClient(
+                        port=self.config.SERIAL_PORT,
+                        baudrate=self.config.BAUD_RATE,
+                        timeout=self.config.TIMEOUT,
+                        parity=self.config.PARITY,
+                        stopbits=self.config.STOPBITS,
+                        bytesize=self.config.BYTESIZE
+                    )
                 else:
-                    logger.error(f"Unsupported connection type: {self.config.CONNECTION_TYPE}")
                     return False
+            else:
+                logger.error(f"Unsupported connection type: {self.config.CONNECTION_TYPE}")
+                return False
+            
+            # Attempt to connect
+            if self.client:
+                self.connected = await self.client.connect()
                 
-                # Attempt to connect
-                if self.client:
-                    self.connected = self.client.connect()
+                if self.connected:
+                    logger.info(f"Successfully connected to PLC on {self.config.SERIAL_PORT}")
+                    self.plc_status['connected'] = True
+                    
+                    # Test communication with a simple read, queued ahead of the first poll
+                    # rather than awaited so connect() returns without a Modbus round trip
+                    test_future = self._loop.create_future()
+                    test_future.add_done_callback(self._communication_tested)
+                    self._io_queue.put_nowait((self._test_communication, test_future))
                     
-                    if self.connected:
-                        logger.info(f"Successfully connected to PLC on {self.config.SERIAL_PORT}")
-                        self.plc_status['connected'] = True
-                        
-                        # Test communication with a simple read
-                        test_result = self._test_communication()
-                        if not test_result:
-                            logger.warning("PLC connection established but communication test failed")
-                            
-                        return True
-                    else:
-                        logger.error("Failed to establish PLC connection")
-                        return False
+                    return True
                 else:
+                    logger.error("Failed to establish PLC connection")
                     return False
-                    
+            else:
+                return False
+                
         except Exception as e:
             logger.error(f"Error connecting to PLC: {e}")
             self.connected = False
@@ -109,22 +226,28 @@ class PLCCommunicator:
             return False
     
     def disconnect(self):
-        """Disconnect from the PLC"""
+        """Disconnect from the PLC (safe to call from any thread)"""
         try:
-            with self.connection_lock:
-                if self.client and self.connected:
+            if self.client and self.connected:
+                loop = self._loop
+                if loop is not None and loop.is_running():
+                    # The client belongs to the polling loop, close it there
+                    loop.call_soon_threadsafe(self.client.close)
+                else:
                     self.client.close()
-                    self.connected = False
-                    self.plc_status['connected'] = False
-                    logger.info("Disconnected from PLC")
+                self.connected = False
+                self.plc_status['connected'] = False
+                logger.info("Disconnected from PLC")
         except Exception as e:
             logger.error(f"Error disconnecting from PLC: {e}")
     
-    def _test_communication(self):
+    async def _test_communication(self):
         """Test PLC communication with a simple read operation"""
         try:
             # Try to read a single coil (address 0)
-            result = self.client.read_coils(0, 1, unit=self.config.DEVICE_ADDRESS)
+            await self._wait_silent_interval()
+            result = await self.client.read_coils(0, 1, slave=self.config.DEVICE_ADDRESS)
+            self._end_frame()
             if not result.isError():
                 logger.info("PLC communication test successful")
                 return True
@@ -135,7 +258,76 @@ class PLCCommunicator:
             logger.error(f"PLC communication test error: {e}")
             return False
     
-    def poll_data(self):
+    def _communication_tested(self, future):
+        """Report the result of the communication test queued by connect()"""
+        if future.cancelled() or future.exception() or not future.result():
+            logger.warning("PLC connection established but communication test failed")
+    
+    async def _wait_silent_interval(self):
+        """Keep the RTU inter-frame gap before the next request goes out"""
+        remaining = self.last_frame_time + self.config.SILENT_INTERVAL - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+    
+    def _end_frame(self):
+        """Mark the end of a request/response exchange on the bus"""
+        self.last_frame_time = time.monotonic()
+    
+    async def _read_combined_block(self):
+        """Read the PLC_BLOCK_START window and unpack it into the input, coil and register arrays"""
+        await self._wait_silent_interval()
+        result = await self.client.read_holding_registers(
+            self.config.PLC_BLOCK_START, self.config.PLC_BLOCK_LEN, slave=self.config.DEVICE_ADDRESS)
+        self._end_frame()
+        if result.isError():
+            return
+        
+        words = result.registers
+        input_words = (INPUT_COUNT + 15) // 16
+        coil_words = (COIL_COUNT + 15) // 16
+        if len(words) < input_words + coil_words:
+            return
+        
+        # Bit images are LSB first: bit 0 of the first word is X000 / Y000
+        self._inputs[:] = b''.join(map(_spread_bits, words[:input_words]))[:INPUT_COUNT]
+        self._coils[:] = b''.join(map(_spread_bits, words[input_words:input_words + coil_words]))[:COIL_COUNT]
+        self._input_count = INPUT_COUNT
+        self._coil_count = COIL_COUNT
+        
+        registers = words[input_words + coil_words:input_words + coil_words + REGISTER_COUNT]
+        n = len(registers)
+        self._registers[:n] = array('H', registers)
+        self._register_count = n
+    
+    async def _read_batch(self, kind, start, count):
+        """Read one block of coils, inputs or registers into its value array, False on an error reply"""
+        await self._wait_silent_interval()
+        if kind == 'registers':
+            result = await self.client.read_holding_registers(start, count, slave=self.config.DEVICE_ADDRESS)
+        elif kind == 'coils':
+            result = await self.client.read_coils(start, count, slave=self.config.DEVICE_ADDRESS)
+        else:
+            result = await self.client.read_discrete_inputs(start, count, slave=self.config.DEVICE_ADDRESS)
+        self._end_frame()
+        if result.isError():
+            return False
+        
+        if kind == 'registers':
+            n = min(len(result.registers), count)
+            self._registers[start:start + n] = array('H', result.registers[:n])
+            self._register_count = max(self._register_count, start + n)
+        else:
+            values = self._coils if kind == 'coils' else self._inputs
+            # pymodbus pads bits to a whole byte
+            n = min(len(result.bits), count)
+            values[start:start + n] = bytes(result.bits[:n])
+            if kind == 'coils':
+                self._coil_count = max(self._coil_count, start + n)
+            else:
+                self._input_count = max(self._input_count, start + n)
+        return True
+    
+    async def poll_data(self):
         """Poll data from the PLC"""
         if not self.connected:
             logger.warning("Cannot poll data - PLC not connected")
@@ -149,37 +341,39 @@ class PLCCommunicator:
             logger.warning("Cannot poll data - No PLC client available")
             return False
         
+        return await self._submit(self._read_poll_data)
+    
+    async def _read_poll_data(self):
+        """Read this poll's points, run by the I/O worker"""
         try:
-            with self.connection_lock:
-                # Read coils (digital outputs) - addresses 0-15
+            if MODBUS_AVAILABLE and self.config.PLC_BLOCK_START is not None:
+                # One request for inputs, coils and registers
+                await self._read_combined_block()
+                self.last_update, self.last_update_mono = time.time(), time.monotonic()
+            
+            elif MODBUS_AVAILABLE and self.config.POLL_ROUND_ROBIN:
+                # One batch per poll, the others keep their values from earlier rounds
+                self.batch_offset = self._batch_idx
+                self._batch_idx = (self._batch_idx + 1) % len(self._batches)
+                if await self._read_batch(*self._batches[self.batch_offset]):
+                    self._batch_times[self.batch_offset] = (time.time(), time.monotonic())
+                # The data is only as fresh as its oldest batch
+                read_times = [t for t in self._batch_times if t is not None]
+                if read_times:
+                    self.last_update, self.last_update_mono = min(read_times, key=itemgetter(1))
+            
+            else:
                 if MODBUS_AVAILABLE:
-                    coil_result = self.client.read_coils(0, 16, slave=self.config.DEVICE_ADDRESS)
-                    if not coil_result.isError():
-                        self.plc_status['coil_status'] = {
-                            f'Y{i:03d}': bool(coil_result.bits[i]) for i in range(len(coil_result.bits))
-                        }
-                    
-                    # Read discrete inputs (digital inputs) - addresses 0-15
-                    input_result = self.client.read_discrete_inputs(0, 16, slave=self.config.DEVICE_ADDRESS)
-                    if not input_result.isError():
-                        self.plc_status['input_status'] = {
-                            f'X{i:03d}': bool(input_result.bits[i]) for i in range(len(input_result.bits))
-                        }
-                    
-                    # Read holding registers (analog/data registers) - addresses 0-9
-                    register_result = self.client.read_holding_registers(0, 10, slave=self.config.DEVICE_ADDRESS)
-                    if not register_result.isError():
-                        self.plc_status['data_registers'] = {
-                            f'DS{i+1:03d}': register_result.registers[i] for i in range(len(register_result.registers))
-                        }
-                
-                # Update status
-                self.plc_status['last_update'] = datetime.now().isoformat()
-                self.last_update = time.time()
-                
-                logger.debug("PLC data polling completed successfully")
-                return True
-                
+                    for batch in self._batches:
+                        await self._read_batch(*batch)
+                self.last_update, self.last_update_mono = time.time(), time.monotonic()
+            
+            # Update status
+            self._publish()
+            
+            logger.debug("PLC data polling completed successfully")
+            return True
+            
         except Exception as e:
             if MODBUS_AVAILABLE:
                 logger.error(f"Modbus communication error: {e}")
@@ -191,108 +385,222 @@ class PLCCommunicator:
     def _simulate_plc_data(self):
         """Generate simulated PLC data for demonstration"""
         self.simulation_counter += 1
-        current_time = time.time()
         
-        # Simulate digital inputs with some patterns
-        input_status = {}
-        for i in range(16):
-            # Create some interesting patterns
-            if i < 4:
-                # Toggle every few seconds
-                input_status[f'X{i:03d}'] = (self.simulation_counter // (i + 2)) % 2 == 0
-            elif i < 8:
-                # Random states
-                input_status[f'X{i:03d}'] = random.random() > 0.7
-            else:
-                # Mostly off with occasional on
-                input_status[f'X{i:03d}'] = random.random() > 0.9
+        counter = self.simulation_counter
+        rand = random.random
         
-        # Simulate digital outputs (some follow inputs, some are independent)
-        coil_status = {}
-        for i in range(16):
-            if i < 4:
-                # Mirror some inputs
-                coil_status[f'Y{i:03d}'] = input_status.get(f'X{i:03d}', False)
-            elif i < 8:
-                # Toggle patterns
-                coil_status[f'Y{i:03d}'] = (self.simulation_counter // (i - 2)) % 2 == 0
-            else:
-                # Random states
-                coil_status[f'Y{i:03d}'] = random.random() > 0.8
+        # Simulate digital inputs: X000-X003 toggle every few seconds, the rest are random
+        # (X004-X007 on 30% of the time, X008 onward mostly off)
+        inputs = self._inputs
+        inputs[:4] = bytes([(counter // d) % 2 == 0 for d in _SIM_TOGGLE_DIVISORS])
+        inputs[4:] = bytes([rand() > t for t in _SIM_INPUT_THRESHOLDS])
         
-        # Simulate data registers with various patterns
-        data_registers = {}
-        for i in range(10):
-            if i == 0:
-                # Counter
-                data_registers[f'DS{i+1:03d}'] = self.simulation_counter % 1000
-            elif i == 1:
-                # Sine wave (temperature simulation)
-                data_registers[f'DS{i+1:03d}'] = int(200 + 50 * math.sin(current_time / 10))
-            elif i == 2:
-                # Random value (pressure)
-                data_registers[f'DS{i+1:03d}'] = int(random.uniform(100, 500))
-            elif i == 3:
-                # Saw tooth pattern
-                data_registers[f'DS{i+1:03d}'] = (self.simulation_counter * 5) % 1000
-            else:
-                # Various random patterns
-                data_registers[f'DS{i+1:03d}'] = int(random.uniform(0, 65535))
+        # Simulate digital outputs: Y000-Y003 mirror inputs, Y004-Y007 toggle, the rest are random
+        coils = self._coils
+        coils[:4] = inputs[:4]
+        coils[4:8] = bytes([(counter // d) % 2 == 0 for d in _SIM_COIL_DIVISORS])
+        coils[8:] = bytes([rand() > 0.8 for _ in _SIM_RANDOM_COILS])
         
-        # Update the PLC status
-        self.plc_status.update({
-            'input_status': input_status,
-            'coil_status': coil_status,
-            'data_registers': data_registers,
-            'last_update': datetime.now().isoformat()
-        })
+        # Simulate data registers: counter, sine wave (temperature), random value (pressure),
+        # saw tooth, then random 16-bit values
+        registers = self._registers
+        registers[0] = counter % 1000
+        sin, cos = self._sim_sin, self._sim_cos
+        self._sim_sin = sin * self._sim_step_cos + cos * self._sim_step_sin
+        self._sim_cos = cos * self._sim_step_cos - sin * self._sim_step_sin
+        registers[1] = int(200 + 50 * self._sim_sin)
+        registers[2] = 100 + int(rand() * 400)
+        registers[3] = (counter * 5) % 1000
+        getrandbits = random.getrandbits
+        registers[4:] = array('H', [getrandbits(16) for _ in _SIM_RANDOM_REGISTERS])
         
-        self.last_update = time.time()
+        # Update the PLC status
+        self._input_count = INPUT_COUNT
+        self._coil_count = COIL_COUNT
+        self._register_count = REGISTER_COUNT
+        self.last_update, self.last_update_mono = time.time(), time.monotonic()
+        self._publish()
         logger.debug("Simulated PLC data generated successfully")
         return True
     
+    # The point dicts are built once per poll by _publish. map(bool, ...) converts the 0/1
+    # bytes in C and returns the True/False singletons; a (False, True)[b] lookup table is
+    # slower from Python, and the dashboard and scripts expect JSON booleans, not 0/1
+    @property
+    def input_status(self):
+        """Digital inputs as {'X000': bool, ...}, built from the input array on demand"""
+        return dict(zip(_INPUT_KEYS, map(bool, self._inputs[:self._input_count])))
+    
+    @property
+    def coil_status(self):
+        """Coils as {'Y000': bool, ...}, built from the coil array on demand"""
+        return dict(zip(_COIL_KEYS, map(bool, self._coils[:self._coil_count])))
+    
+    @property
+    def data_registers(self):
+        """Holding registers as {'DS001': int, ...}, built from the register array on demand"""
+        return dict(zip(_REGISTER_KEYS, self._registers[:self._register_count]))
+    
+    def _publish(self):
+        """Build this poll's snapshot and make it the current one"""
+        last_update = self.last_update
+        data = {
+            'last_update': datetime.fromtimestamp(last_update).isoformat() if last_update else None,
+            'data_registers': self.data_registers,
+            'coil_status': self.coil_status,
+            'input_status': self.input_status,
+            'batch_offset': self.batch_offset,
+        }
+        # Data age is measured on the monotonic clock, the wall-clock time is only displayed.
+        # The JSON members are encoded once here and reused by every status request
+        self._snapshot = PlcSnapshot(
+            updated_mono=self.last_update_mono,
+            fresh_seconds=self.config.POLL_INTERVAL * 2,
+            data=data,
+            data_json=_dumps(data)[1:-1],
+        )
+    
+    def _live_status(self, snapshot):
+        """Status fields that change between polls: connection state, errors and data age"""
+        status = self.plc_status.copy()
+        if snapshot.updated_mono is not None:
+            now = time.monotonic()
+            cached_snapshot, valid_until, age, fresh = self._age_cache
+            if cached_snapshot is not snapshot or now >= valid_until:
+                # Age is shown to 0.1 s, so a burst of requests shares one calculation
+                age_seconds = snapshot.data_age_seconds
+                age = round(age_seconds, 1)
+                fresh = age_seconds < snapshot.fresh_seconds
+                self._age_cache = (snapshot, now + AGE_CACHE_SECONDS, age, fresh)
+            status['data_age_seconds'] = age
+            status['data_fresh'] = fresh
+        return status
+    
     def get_status(self):
-        """Get current PLC status and data"""
-        # Add connection age information
-        if self.last_update:
-            age_seconds = time.time() - self.last_update
-            self.plc_status['data_age_seconds'] = round(age_seconds, 1)
-            self.plc_status['data_fresh'] = age_seconds < (self.config.POLL_INTERVAL * 2)
+        """Get current PLC status and data
         
-        return self.plc_status.copy()
+        The point dicts are shared with other callers until the next poll, treat them as read-only.
+        """
+        snapshot = self._snapshot
+        status = self._live_status(snapshot)
+        status.update(snapshot.data)
+        return status
+    
+    def get_status_json(self):
+        """get_status() as JSON text, only the live fields are encoded per call"""
+        snapshot = self._snapshot
+        return _dumps(self._live_status(snapshot))[:-1] + ',' + snapshot.data_json + '}'
+    
+    async def _io_worker(self):
+        """Run queued Modbus operations one at a time, the only task that talks to the client"""
+        while True:
+            op, future = await self._io_queue.get()
+            try:
+                result = await op()
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+    
+    async def _submit(self, op):
+        """Queue a Modbus operation behind any in progress and wait for its result"""
+        future = self._loop.create_future()
+        await self._io_queue.put((op, future))
+        return await future
+    
+    def _run_on_loop(self, op):
+        """Queue a Modbus operation from another thread; only the calling thread waits"""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return False, "PLC not connected"
+        return asyncio.run_coroutine_threadsafe(self._submit(op), loop).result()
     
     def write_coil(self, address, value):
-        """Write to a single coil (digital output)"""
+        """Write to a single coil (digital output), callable from web and script threads"""
         if not self.connected or not self.client:
             return False, "PLC not connected"
-        
+        return self._run_on_loop(partial(self._write_coil, address, value))
+    
+    def write_register(self, address, value):
+        """Write to a single holding register, callable from web and script threads"""
+        if not self.connected or not self.client:
+            return False, "PLC not connected"
+        return self._run_on_loop(partial(self._write_register, address, value))
+    
+    def write_coils(self, address, values):
+        """Write consecutive coils from address in one transaction (function code 15)"""
+        if not self.connected or not self.client:
+            return False, "PLC not connected"
+        return self._run_on_loop(partial(self._write_coils, address, list(values)))
+    
+    def write_registers(self, address, values):
+        """Write consecutive holding registers from address in one transaction (function code 16)"""
+        if not self.connected or not self.client:
+            return False, "PLC not connected"
+        return self._run_on_loop(partial(self._write_registers, address, list(values)))
+    
+    async def _write_coil(self, address, value):
+        """Write a coil, run by the I/O worker"""
         try:
-            with self.connection_lock:
-                result = self.client.write_coil(address, value, unit=self.config.DEVICE_ADDRESS)
-                if not result.isError():
-                    logger.info(f"Successfully wrote coil {address}: {value}")
-                    return True, "Success"
-                else:
-                    logger.error(f"Failed to write coil {address}: {result}")
-                    return False, str(result)
+            await self._wait_silent_interval()
+            result = await self.client.write_coil(address, value, slave=self.config.DEVICE_ADDRESS)
+            self._end_frame()
+            if not result.isError():
+                logger.info(f"Successfully wrote coil {address}: {value}")
+                return True, "Success"
+            else:
+                logger.error(f"Failed to write coil {address}: {result}")
+                return False, str(result)
         except Exception as e:
             logger.error(f"Error writing coil {address}: {e}")
             return False, str(e)
     
-    def write_register(self, address, value):
-        """Write to a single holding register"""
-        if not self.connected or not self.client:
-            return False, "PLC not connected"
-        
+    async def _write_register(self, address, value):
+        """Write a holding register, run by the I/O worker"""
         try:
-            with self.connection_lock:
-                result = self.client.write_register(address, value, unit=self.config.DEVICE_ADDRESS)
-                if not result.isError():
-                    logger.info(f"Successfully wrote register {address}: {value}")
-                    return True, "Success"
-                else:
-                    logger.error(f"Failed to write register {address}: {result}")
-                    return False, str(result)
+            await self._wait_silent_interval()
+            result = await self.client.write_register(address, value, slave=self.config.DEVICE_ADDRESS)
+            self._end_frame()
+            if not result.isError():
+                logger.info(f"Successfully wrote register {address}: {value}")
+                return True, "Success"
+            else:
+                logger.error(f"Failed to write register {address}: {result}")
+                return False, str(result)
         except Exception as e:
             logger.error(f"Error writing register {address}: {e}")
             return False, str(e)
+    
+    async def _write_coils(self, address, values):
+        """Write a range of coils, run by the I/O worker"""
+        try:
+            await self._wait_silent_interval()
+            result = await self.client.write_coils(address, values, slave=self.config.DEVICE_ADDRESS)
+            self._end_frame()
+            if not result.isError():
+                logger.info(f"Successfully wrote {len(values)} coils from {address}: {values}")
+                return True, "Success"
+            else:
+                logger.error(f"Failed to write coils from {address}: {result}")
+                return False, str(result)
+        except Exception as e:
+            logger.error(f"Error writing coils from {address}: {e}")
+            return False, str(e)
+    
+    async def _write_registers(self, address, values):
+        """Write a range of holding registers, run by the I/O worker"""
+        try:
+            await self._wait_silent_interval()
+            result = await self.client.write_registers(address, values, slave=self.config.DEVICE_ADDRESS)
+            self._end_frame()
+            if not result.isError():
+                logger.info(f"Successfully wrote {len(values)} registers from {address}: {values}")
+                return True, "Success"
+            else:
+                logger.error(f"Failed to write registers from {address}: {result}")
+                return False, str(result)
+        except Exception as e:
+            logger.error(f"Error writing registers from {address}: {e}")
+            return False, str(e)
@@ -3,14 +3,111 @@ Web server module for serving PLC status data
 Provides REST API and web interface for PLC monitoring
 """
 
+import io
 import json
+import time
+import hashlib
+import zipfile
 import logging
-from datetime import datetime
-from flask import Flask, render_template, jsonify, request, Response
+from functools import wraps, lru_cache
+from operator import itemgetter
+from flask import Flask, render_template, jsonify, request, Response, make_response, send_file, g
+from flask.json.provider import DefaultJSONProvider
 import os
 
+from custom_scripts import ScriptIR
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Script fields listed by /api/scripts, pulled out of each script with one C-level call
+SCRIPT_SUMMARY_FIELDS = ('name', 'description', 'enabled', 'gpio_pins')
+_script_summary = itemgetter(*SCRIPT_SUMMARY_FIELDS)
+
+# /api/health body, filled with the plc_connected flag and the epoch-ms timestamp
+HEALTH_RESPONSE_TEMPLATE = b'{"status":"healthy","plc_connected":%s,"timestamp":%d}'
+
+def _json_default(obj):
+    """Fallback for values the JSON encoders do not handle, e.g. sets and Decimals from user scripts"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return DefaultJSONProvider.default(obj)
+
+def _encode_json(payload):
+    """Encode a JSON payload to bytes, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_json_default).encode()
+
+@lru_cache(maxsize=None)
+def _error_body(error, with_success=True):
+    """JSON body for a fixed error message, encoded once per message"""
+    payload = {'success': False, 'error': error} if with_success else {'error': error}
+    return _encode_json(payload)
+
+def _json_body():
+    """Request body as a JSON object, None when it is missing, malformed or not an object"""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else None
+
+def _request_timestamp():
+    """Time of the current request, taken on first use and shared by its responses
+    
+    This is the one format of the top-level 'timestamp' field in every Pi API response: an integer
+    number of Unix epoch milliseconds (the dashboard does not read it, clients can use new Date(ms)).
+    """
+    timestamp = g.get('timestamp')
+    if timestamp is None:
+        timestamp = g.timestamp = int(time.time() * 1000)
+    return timestamp
+
+def etagged(view):
+    """Send a strong ETag on 200 responses and answer 304 when If-None-Match still matches"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response.add_etag()
+            response.cache_control.private = True
+            response.cache_control.must_revalidate = True
+            # Drops the body and switches to 304 when the client's copy is current
+            response.make_conditional(request)
+        return response
+    return wrapper
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by every jsonify() and request.get_json()"""
+    
+    def dumps(self, obj, **kwargs):
+        # Types orjson does not encode itself (e.g. Decimal, set) go through the shared fallback
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 class WebServer:
     """Flask-based web server for PLC status display"""
     
@@ -20,41 +117,101 @@ class WebServer:
         self.script_engine = script_engine
         self.script_executor = script_executor
         self.app = Flask(__name__)
+        if ORJSON_AVAILABLE:
+            self.app.json = OrjsonProvider(self.app)
+        if COMPRESS_AVAILABLE:
+            # gzip JSON and pages over 1 KB for the Pi's WiFi link; the ESP-32 ZIP is already deflated
+            self.app.config.update(
+                COMPRESS_MIMETYPES=['application/json', 'text/html'],
+                COMPRESS_LEVEL=6,
+                COMPRESS_MIN_SIZE=1024
+            )
+            Compress(self.app)
+        
+        # Rendered pages by template name, (html, etag). The templates take no context, so
+        # each is rendered on its first request and then served as a static string
+        self._pages = {}
+        
+        # The ESP-32 files only change on disk between restarts, so the download is zipped once
+        self._esp32_zip = None
+        self._esp32_zip_etag = None
+        self._esp32_zip_mtime = None
+        try:
+            self._build_esp32_zip()
+        except Exception as e:
+            logger.error(f"Error creating ESP-32 download: {e}")
+        
         self.setup_routes()
     
+    def _page(self, template):
+        """HTML page from a context-free template, rendered once unless DEBUG reloads templates"""
+        page = self._pages.get(template)
+        if page is None:
+            # Rendered inside a request so url_for() links match how the app is mounted
+            html = render_template(template)
+            page = (html, hashlib.md5(html.encode()).hexdigest())
+            if not self.config.DEBUG:
+                self._pages[template] = page
+        
+        response = Response(page[0], mimetype='text/html')
+        response.set_etag(page[1])
+        return response.make_conditional(request)
+    
+    @staticmethod
+    def _json(payload, status=200):
+        """JSON response for the polled endpoints, encoded straight to bytes without jsonify"""
+        return Response(_encode_json(payload), status=status, mimetype='application/json')
+    
+    @staticmethod
+    def _error(error, status, with_success=True):
+        """Error response for a fixed message, no JSON encoding after the first use"""
+        return Response(_error_body(error, with_success), status=status, mimetype='application/json')
+    
     def setup_routes(self):
         """Setup Flask routes"""
         
         @self.app.route('/')
         def index():
             """Main status page"""
-            return render_template('index.html')
+            return self._page('index.html')
         
         @self.app.route('/api/status')
         def api_status():
             """API endpoint for PLC status"""
             try:
-                status = self.plc_communicator.get_status()
-                return jsonify({
-                    'success': True,
-                    'data': status,
-                    'timestamp': datetime.now().isoformat()
-                })
+                if MSGPACK_AVAILABLE and request.accept_mimetypes.best_match(
+                        ('application/json', 'application/msgpack')) == 'application/msgpack':
+                    # Binary variant for clients that ask for it, register values stay integers
+                    body = msgpack.packb({
+                        'success': True,
+                        'data': self.plc_communicator.get_status(),
+                        'timestamp': _request_timestamp()
+                    }, use_bin_type=True)
+                    response = Response(body, mimetype='application/msgpack')
+                else:
+                    # The point data arrives pre-encoded from the last poll, only the envelope is built here
+                    status_json = self.plc_communicator.get_status_json()
+                    body = f'{{"success": true, "data": {status_json}, "timestamp": {_request_timestamp()}}}'
+                    response = Response(body, mimetype='application/json')
+                response.vary.add('Accept')
+                # Tabs refreshing faster than once a second reuse the last reply
+                response.cache_control.max_age = 1
+                return response
             except Exception as e:
                 logger.error(f"Error getting PLC status: {e}")
-                return jsonify({
+                return self._json({
                     'success': False,
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                }), 500
+                    'timestamp': _request_timestamp()
+                }, 500)
         
         @self.app.route('/api/coil/<int:address>', methods=['POST'])
         def api_write_coil(address):
             """API endpoint to write coil value"""
             try:
-                data = request.get_json()
-                if 'value' not in data:
-                    return jsonify({'success': False, 'error': 'Missing value parameter'}), 400
+                data = _json_body()
+                if data is None or 'value' not in data:
+                    return self._error('Missing value parameter', 400)
                 
                 value = bool(data['value'])
                 success, message = self.plc_communicator.write_coil(address, value)
@@ -64,25 +221,28 @@ class WebServer:
                     'message': message,
                     'address': address,
                     'value': value,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
                 })
             except Exception as e:
                 logger.error(f"Error writing coil {address}: {e}")
                 return jsonify({
                     'success': False,
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
                 }), 500
         
         @self.app.route('/api/register/<int:address>', methods=['POST'])
         def api_write_register(address):
             """API endpoint to write register value"""
             try:
-                data = request.get_json()
-                if 'value' not in data:
-                    return jsonify({'success': False, 'error': 'Missing value parameter'}), 400
+                data = _json_body()
+                if data is None or 'value' not in data:
+                    return self._error('Missing value parameter', 400)
                 
-                value = int(data['value'])
+                try:
+                    value = int(data['value'])
+                except (TypeError, ValueError):
+                    return self._error('Invalid register value', 400)
                 success, message = self.plc_communicator.write_register(address, value)
                 
                 return jsonify({
@@ -90,112 +250,151 @@ class WebServer:
                     'message': message,
                     'address': address,
                     'value': value,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
                 })
             except Exception as e:
                 logger.error(f"Error writing register {address}: {e}")
                 return jsonify({
                     'success': False,
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
+                }), 500
+        
+        @self.app.route('/api/coils/<int:address>', methods=['POST'])
+        def api_write_coils(address):
+            """API endpoint to write consecutive coils in one Modbus transaction"""
+            try:
+                data = _json_body()
+                values = data.get('values') if data else None
+                if not isinstance(values, list) or not values:
+                    return self._error('Missing values list', 400)
+                
+                values = [bool(v) for v in values]
+                success, message = self.plc_communicator.write_coils(address, values)
+                
+                return jsonify({
+                    'success': success,
+                    'message': message,
+                    'address': address,
+                    'values': values,
+                    'timestamp': _request_timestamp()
+                })
+            except Exception as e:
+                logger.error(f"Error writing coils from {address}: {e}")
+                return jsonify({
+                    'success': False,
+                    'error': str(e),
+                    'timestamp': _request_timestamp()
+                }), 500
+        
+        @self.app.route('/api/registers/<int:address>', methods=['POST'])
+        def api_write_registers(address):
+            """API endpoint to write consecutive registers in one Modbus transaction"""
+            try:
+                data = _json_body()
+                values = data.get('values') if data else None
+                if not isinstance(values, list) or not values:
+                    return self._error('Missing values list', 400)
+                
+                try:
+                    values = [int(v) for v in values]
+                except (TypeError, ValueError):
+                    return self._error('Invalid register value', 400)
+                success, message = self.plc_communicator.write_registers(address, values)
+                
+                return jsonify({
+                    'success': success,
+                    'message': message,
+                    'address': address,
+                    'values': values,
+                    'timestamp': _request_timestamp()
+                })
+            except Exception as e:
+                logger.error(f"Error writing registers from {address}: {e}")
+                return jsonify({
+                    'success': False,
+                    'error': str(e),
+                    'timestamp': _request_timestamp()
                 }), 500
         
         @self.app.route('/api/health')
         def api_health():
             """Health check endpoint"""
-            return jsonify({
-                'status': 'healthy',
-                'plc_connected': self.plc_communicator.connected,
-                'timestamp': datetime.now().isoformat()
-            })
+            # Fixed shape, only the flag and timestamp are filled in (no JSON encoder call)
+            body = HEALTH_RESPONSE_TEMPLATE % (
+                b'true' if self.plc_communicator.connected else b'false',
+                _request_timestamp()
+            )
+            return Response(body, mimetype='application/json')
         
         @self.app.route('/download/esp32')
         def download_esp32_files():
             """Download ESP-32 files as a ZIP archive"""
-            import zipfile
-            import tempfile
-            import os
-            from flask import send_file
-            
             try:
-                # Create temporary ZIP file
-                temp_dir = tempfile.mkdtemp()
-                zip_path = os.path.join(temp_dir, 'ESP32_PLC_Bridge.zip')
-                
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    # Add all ESP-32 files to ZIP
-                    esp32_files = {
-                        'boot.py': self._get_boot_py_content(),
-                        'config.py': self._get_config_py_content(),
-                        'main.py': self._get_main_py_content(),
-                        'custom_scripts.py': self._get_custom_scripts_py_content(),
-                        'wifi_debug.py': self._get_wifi_debug_py_content(),
-                        'README.md': self._get_readme_content()
-                    }
-                    
-                    for filename, content in esp32_files.items():
-                        zipf.writestr(filename, content)
+                if self._esp32_zip is None:
+                    # Building at startup failed, try again now
+                    self._build_esp32_zip()
                 
                 return send_file(
-                    zip_path,
+                    io.BytesIO(self._esp32_zip),
                     as_attachment=True,
                     download_name='ESP32_PLC_Bridge.zip',
-                    mimetype='application/zip'
+                    mimetype='application/zip',
+                    etag=self._esp32_zip_etag,
+                    last_modified=self._esp32_zip_mtime,
+                    conditional=True
                 )
                 
             except Exception as e:
                 logger.error(f"Error creating ESP-32 download: {e}")
-                return jsonify({'error': 'Failed to create download package'}), 500
+                return self._error('Failed to create download package', 500, with_success=False)
         
         # Custom Scripts Routes
         @self.app.route('/scripts')
         def scripts_page():
             """Custom scripts management page"""
-            return render_template('scripts.html')
+            return self._page('scripts.html')
         
         @self.app.route('/api/scripts')
+        @etagged
         def api_scripts():
             """Get all custom scripts"""
             if not self.script_engine:
-                return jsonify({'success': False, 'error': 'Script engine not available'}), 503
+                return self._error('Script engine not available', 503)
             
             try:
-                scripts = {}
-                for script_id, script in self.script_engine.scripts.items():
-                    scripts[script_id] = {
-                        'id': script_id,
-                        'name': script['name'],
-                        'description': script['description'],
-                        'enabled': script['enabled'],
-                        'gpio_pins': script['gpio_pins']
-                    }
+                scripts = {
+                    script_id: dict(zip(SCRIPT_SUMMARY_FIELDS, _script_summary(script)), id=script_id)
+                    for script_id, script in self.script_engine.scripts.items()
+                }
                 
-                return jsonify({
+                # No per-request timestamp, the body only changes with the scripts so the ETag holds
+                return self._json({
                     'success': True,
-                    'scripts': scripts,
-                    'timestamp': datetime.now().isoformat()
+                    'scripts': scripts
                 })
             except Exception as e:
                 logger.error(f"Error getting scripts: {e}")
-                return jsonify({'success': False, 'error': str(e)}), 500
+                return self._json({'success': False, 'error': str(e)}, 500)
         
         @self.app.route('/api/scripts/<script_id>')
+        @etagged
         def api_script_detail(script_id):
             """Get detailed script information including code"""
             if not self.script_engine:
-                return jsonify({'success': False, 'error': 'Script engine not available'}), 503
+                return self._error('Script engine not available', 503)
             
             try:
-                if script_id not in self.script_engine.scripts:
-                    return jsonify({'success': False, 'error': 'Script not found'}), 404
+                script = self.script_engine.scripts.get(script_id)
+                if script is None:
+                    return self._error('Script not found', 404)
                 
-                script = self.script_engine.scripts[script_id].copy()
-                script['id'] = script_id
+                script = dict(script, id=script_id)
                 
-                return jsonify({
+                # No per-request timestamp, the body only changes with the script so the ETag holds
+                return self._json({
                     'success': True,
-                    'script': script,
-                    'timestamp': datetime.now().isoformat()
+                    'script': script
                 })
             except Exception as e:
                 logger.error(f"Error getting script {script_id}: {e}")
@@ -205,22 +404,22 @@ class WebServer:
         def api_script_toggle(script_id):
             """Toggle script enabled/disabled"""
             if not self.script_engine:
-                return jsonify({'success': False, 'error': 'Script engine not available'}), 503
+                return self._error('Script engine not available', 503)
             
             try:
-                if script_id not in self.script_engine.scripts:
-                    return jsonify({'success': False, 'error': 'Script not found'}), 404
+                script = self.script_engine.scripts.get(script_id)
+                if script is None:
+                    return self._error('Script not found', 404)
                 
-                current_state = self.script_engine.scripts[script_id]['enabled']
-                new_state = not current_state
-                self.script_engine.scripts[script_id]['enabled'] = new_state
+                new_state = not script['enabled']
+                script['enabled'] = new_state
                 
                 return jsonify({
                     'success': True,
                     'script_id': script_id,
                     'enabled': new_state,
                     'message': f"Script {'enabled' if new_state else 'disabled'}",
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
                 })
             except Exception as e:
                 logger.error(f"Error toggling script {script_id}: {e}")
@@ -230,17 +429,23 @@ class WebServer:
         def api_script_update(script_id):
             """Update script code and configuration"""
             if not self.script_engine:
-                return jsonify({'success': False, 'error': 'Script engine not available'}), 503
+                return self._error('Script engine not available', 503)
             
             try:
-                data = request.get_json()
+                data = _json_body()
                 if not data:
-                    return jsonify({'success': False, 'error': 'No data provided'}), 400
+                    return self._error('No data provided', 400)
                 
-                if script_id not in self.script_engine.scripts:
-                    return jsonify({'success': False, 'error': 'Script not found'}), 404
+                script = self.script_engine.scripts.get(script_id)
+                if script is None:
+                    return self._error('Script not found', 404)
                 
-                script = self.script_engine.scripts[script_id]
+                ir = data.get('ir')
+                if ir is not None:
+                    try:
+                        ScriptIR.from_dict(ir)
+                    except (ValueError, TypeError, AttributeError) as e:
+                        return jsonify({'success': False, 'error': f'Invalid script IR: {e}'}), 400
                 
                 # Update script properties
                 if 'name' in data:
@@ -248,7 +453,12 @@ class WebServer:
                 if 'description' in data:
                     script['description'] = data['description']
                 if 'code' in data:
+                    if data['code'] != script['code']:
+                        # Edited code no longer matches the script's IR, run the code instead
+                        script.pop('ir', None)
                     script['code'] = data['code']
+                if ir is not None:
+                    script['ir'] = ir
                 if 'gpio_pins' in data:
                     script['gpio_pins'] = data['gpio_pins']
                 if 'enabled' in data:
@@ -258,7 +468,7 @@ class WebServer:
                     'success': True,
                     'script_id': script_id,
                     'message': 'Script updated successfully',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
                 })
             except Exception as e:
                 logger.error(f"Error updating script {script_id}: {e}")
@@ -268,12 +478,12 @@ class WebServer:
         def api_script_create():
             """Create new custom script"""
             if not self.script_engine:
-                return jsonify({'success': False, 'error': 'Script engine not available'}), 503
+                return self._error('Script engine not available', 503)
             
             try:
-                data = request.get_json()
+                data = _json_body()
                 if not data:
-                    return jsonify({'success': False, 'error': 'No data provided'}), 400
+                    return self._error('No data provided', 400)
                 
                 required_fields = ['id', 'name', 'description', 'code']
                 for field in required_fields:
@@ -282,7 +492,7 @@ class WebServer:
                 
                 script_id = data['id']
                 if script_id in self.script_engine.scripts:
-                    return jsonify({'success': False, 'error': 'Script ID already exists'}), 400
+                    return self._error('Script ID already exists', 400)
                 
                 new_script = {
                     'name': data['name'],
@@ -291,6 +501,12 @@ class WebServer:
                     'enabled': data.get('enabled', False),
                     'gpio_pins': data.get('gpio_pins', [])
                 }
+                if data.get('ir') is not None:
+                    try:
+                        ScriptIR.from_dict(data['ir'])
+                    except (ValueError, TypeError, AttributeError) as e:
+                        return jsonify({'success': False, 'error': f'Invalid script IR: {e}'}), 400
+                    new_script['ir'] = data['ir']
                 
                 self.script_engine.scripts[script_id] = new_script
                 
@@ -298,7 +514,7 @@ class WebServer:
                     'success': True,
                     'script_id': script_id,
                     'message': 'Script created successfully',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
                 })
             except Exception as e:
                 logger.error(f"Error creating script: {e}")
@@ -308,23 +524,20 @@ class WebServer:
         def api_script_delete(script_id):
             """Delete custom script"""
             if not self.script_engine:
-                return jsonify({'success': False, 'error': 'Script engine not available'}), 503
+                return self._error('Script engine not available', 503)
             
             try:
-                if script_id not in self.script_engine.scripts:
-                    return jsonify({'success': False, 'error': 'Script not found'}), 404
-                
-                del self.script_engine.scripts[script_id]
+                if self.script_engine.scripts.pop(script_id, None) is None:
+                    return self._error('Script not found', 404)
                 
                 # Clean up script state
-                if script_id in self.script_engine.script_states:
-                    del self.script_engine.script_states[script_id]
+                self.script_engine.script_states.pop(script_id, None)
                 
                 return jsonify({
                     'success': True,
                     'script_id': script_id,
                     'message': 'Script deleted successfully',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
                 })
             except Exception as e:
                 logger.error(f"Error deleting script {script_id}: {e}")
@@ -334,30 +547,30 @@ class WebServer:
         def api_script_results():
             """Get current script execution results"""
             if not self.script_executor:
-                return jsonify({'success': False, 'error': 'Script executor not available'}), 503
+                return self._error('Script executor not available', 503)
             
             try:
                 # Get script results from PLC communicator
                 results = getattr(self.plc_communicator, 'script_results', {})
                 
-                return jsonify({
+                return self._json({
                     'success': True,
                     'results': results,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
                 })
             except Exception as e:
                 logger.error(f"Error getting script results: {e}")
-                return jsonify({'success': False, 'error': str(e)}), 500
+                return self._json({'success': False, 'error': str(e)}, 500)
         
         @self.app.route('/api/scripts/<script_id>/execute', methods=['POST'])
         def api_script_execute(script_id):
             """Execute a specific script manually"""
             if not self.script_executor:
-                return jsonify({'success': False, 'error': 'Script executor not available'}), 503
+                return self._error('Script executor not available', 503)
             
             try:
                 if script_id not in self.script_engine.scripts:
-                    return jsonify({'success': False, 'error': 'Script not found'}), 404
+                    return self._error('Script not found', 404)
                 
                 # Get current PLC data
                 plc_data = self.plc_communicator.get_status()
@@ -369,7 +582,7 @@ class WebServer:
                     'success': True,
                     'script_id': script_id,
                     'result': result,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _request_timestamp()
                 })
             except Exception as e:
                 logger.error(f"Error executing script {script_id}: {e}")
@@ -377,11 +590,35 @@ class WebServer:
 
         @self.app.errorhandler(404)
         def not_found(error):
-            return jsonify({'error': 'Not found'}), 404
+            return self._error('Not found', 404, with_success=False)
         
         @self.app.errorhandler(500)
         def internal_error(error):
-            return jsonify({'error': 'Internal server error'}), 500
+            return self._error('Internal server error', 500, with_success=False)
+    
+    def _build_esp32_zip(self):
+        """Zip the ESP-32 files in memory for the download route"""
+        esp32_files = {
+            'boot.py': self._get_boot_py_content(),
+            'config.py': self._get_config_py_content(),
+            'main.py': self._get_main_py_content(),
+            'custom_scripts.py': self._get_custom_scripts_py_content(),
+            'plc_scripts.py': self._get_plc_scripts_py_content(),
+            'html_pages.py': self._get_html_pages_py_content(),
+            'manifest.py': self._get_manifest_py_content(),
+            'wifi_debug.py': self._get_wifi_debug_py_content(),
+            'README.md': self._get_readme_content()
+        }
+        
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for filename, content in esp32_files.items():
+                zipf.writestr(filename, content)
+        
+        data = buffer.getvalue()
+        self._esp32_zip_etag = hashlib.md5(data).hexdigest()
+        self._esp32_zip_mtime = time.time()
+        self._esp32_zip = data
     
     def _get_boot_py_content(self):
         """Get boot.py content for ESP-32"""
@@ -394,7 +631,7 @@ import gc
 import network
 import time
 import sys
-from machine import Pin
+from machine import Pin, Timer
 
 def boot_delay_with_interrupt():
     """5-second boot delay allowing file upload interruption"""
@@ -407,15 +644,24 @@ def boot_delay_with_interrupt():
         print("and upload new files...")
         print()
         
+        # Blink LED from a hardware timer so the countdown just sleeps
+        timer = Timer(0)
+        state = [False]
+        
+        def _tick(_):
+            state[0] = not state[0]
+            led.value(state[0])
+        
+        timer.init(period=500, mode=Timer.PERIODIC, callback=_tick)
+        
         # 5-second countdown with LED indicator
-        for countdown in range(5, 0, -1):
-            print(f"Starting in {countdown} seconds... (Ctrl+C to interrupt)")
-            
-            # Blink LED during countdown
-            led.on()
-            time.sleep(0.5)
+        try:
+            for countdown in range(5, 0, -1):
+                print(f"Starting in {countdown} seconds... (Ctrl+C to interrupt)")
+                time.sleep(1)  # KeyboardInterrupt still breaks this
+        finally:
+            timer.deinit()
             led.off()
-            time.sleep(0.5)
             
         print()
         print("Boot delay complete - starting main application")
@@ -498,6 +744,12 @@ Edit these settings for your specific setup before uploading
 WIFI_SSID = "YOUR_WIFI_SSID"
 WIFI_PASSWORD = "YOUR_WIFI_PASSWORD"
 
+# Access Point Settings (fallback when WiFi fails)
+AP_SSID = "ESP32-PLC-Setup"
+AP_PASSWORD = "plcsetup123"  # At least 8 characters
+AP_CHANNEL = 1
+AP_MAX_CLIENTS = 4
+
 # Hardware Pin Configuration
 UART_TX_PIN = 17  # GPIO17 - Connect to PLC RX
 UART_RX_PIN = 16  # GPIO16 - Connect to PLC TX
@@ -507,7 +759,12 @@ UART_PORT = 2  # Use UART2
 # PLC Communication Settings
 BAUD_RATE = 9600  # Match your PLC settings
 DEVICE_ADDRESS = 1  # Modbus slave address of PLC
-UART_TIMEOUT = 1000  # milliseconds
+UART_CHAR_TIMEOUT = 4  # milliseconds of silence ending a reply (3.5 chars at 9600)
+
+# PLC Poll Blocks - each is read with one Modbus request per poll
+POLL_INPUT_COUNT = 16  # X000 onward (discrete inputs)
+POLL_COIL_COUNT = 16  # Y000 onward (coils)
+POLL_REGISTER_COUNT = 10  # DS001 onward (holding registers)
 
 # Web Server Settings
 WEB_PORT = 80
@@ -516,7 +773,14 @@ POLL_INTERVAL = 2.0  # seconds between PLC polls
 # System Settings
 MAX_RETRIES = 3
 WIFI_TIMEOUT = 20  # seconds
-RESPONSE_TIMEOUT = 100  # milliseconds for Modbus responses'''
+RESPONSE_TIMEOUT = 100  # milliseconds for Modbus responses
+LOG_LEVEL = "INFO"  # DEBUG, INFO, WARN or ERROR
+
+# Access Point Network Configuration
+AP_IP = "192.168.4.1"
+AP_SUBNET = "255.255.255.0"
+AP_GATEWAY = "192.168.4.1"
+AP_DNS = "192.168.4.1"'''
 
     def _get_main_py_content(self):
         """Get main.py content for ESP-32"""
@@ -542,6 +806,30 @@ RESPONSE_TIMEOUT = 100  # milliseconds for Modbus responses'''
         except:
             return "# Custom scripts file not found"
 
+    def _get_plc_scripts_py_content(self):
+        """Get plc_scripts.py content for ESP-32"""
+        try:
+            with open('ESP32_Files/plc_scripts.py', 'r') as f:
+                return f.read()
+        except:
+            return "# Built-in scripts file not found"
+
+    def _get_html_pages_py_content(self):
+        """Get html_pages.py content for ESP-32"""
+        try:
+            with open('ESP32_Files/html_pages.py', 'r') as f:
+                return f.read()
+        except:
+            return "# Web page scaffolding file not found"
+
+    def _get_manifest_py_content(self):
+        """Get manifest.py content for ESP-32 firmware builds"""
+        try:
+            with open('ESP32_Files/manifest.py', 'r') as f:
+                return f.read()
+        except:
+            return "# Frozen module manifest not found"
+
     def _get_readme_content(self):
         """Get README.md content for ESP-32"""
         try:
@@ -553,12 +841,26 @@ RESPONSE_TIMEOUT = 100  # milliseconds for Modbus responses'''
     def run(self):
         """Start the web server"""
         try:
-            self.app.run(
-                host='0.0.0.0',
-                port=self.config.WEB_PORT,
-                debug=self.config.DEBUG,
-                threaded=True
-            )
+            if WAITRESS_AVAILABLE and not self.config.DEBUG:
+                # Production WSGI server, dashboards polling /api/status are served by a
+                # fixed thread pool alongside slow requests such as the ESP-32 download
+                serve(
+                    self.app,
+                    host='0.0.0.0',
+                    port=self.config.WEB_PORT,
+                    threads=self.config.WEB_THREADS,
+                    connection_limit=200,
+                    ident=None  # no Server header
+                )
+            else:
+                if not self.config.DEBUG:
+                    logger.warning("waitress not available, using the Flask development server. Install with: pip install waitress")
+                self.app.run(
+                    host='0.0.0.0',
+                    port=self.config.WEB_PORT,
+                    debug=self.config.DEBUG,
+                    threaded=True
+                )
         except Exception as e:
             logger.error(f"Error starting web server: {e}")
             raise